@@ -34,6 +34,7 @@ def patch_requests():
         "requests.api",
         "requests.cookies",
         "requests.exceptions",
+        "requests.hooks",
         "requests.models",
         "requests.sessions",
         "requests.structures",
@@ -4,7 +4,20 @@ Request adapters.
 See https://requests.readthedocs.io/en/latest/user/advanced/#transport-adapters.
 """
 
-from pycurl_requests.adapters.pycurl import PyCurlBaseAdapter, PyCurlHttpAdapter
+from pycurl_requests.adapters.pycurl import (
+    PyCurlBaseAdapter,
+    PyCurlHttpAdapter,
+    HTTPAdapter,
+)
 from pycurl_requests.adapters.base import BaseAdapter
+from pycurl_requests.adapters.pool import CurlPool
+from pycurl_requests.adapters.retry import Retry
 
-__all__ = ["BaseAdapter", "PyCurlBaseAdapter", "PyCurlHttpAdapter"]
+__all__ = [
+    "BaseAdapter",
+    "CurlPool",
+    "PyCurlBaseAdapter",
+    "PyCurlHttpAdapter",
+    "HTTPAdapter",
+    "Retry",
+]
@@ -0,0 +1,528 @@
+"""
+HTTP response caching (RFC 7234).
+
+A `CachingAdapter` wraps another adapter, serving fresh responses from a
+cache and revalidating stale responses using conditional requests.
+
+Usage::
+  >>> import pycurl_requests as requests
+  >>> from pycurl_requests.adapters.cache import CachingAdapter, MemoryCache
+  >>> s = requests.Session()
+  >>> s.mount('https://', CachingAdapter(cache=MemoryCache(max_size=2**26)))
+"""
+
+import collections
+import copy
+import email.utils
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from pycurl_requests import models
+from pycurl_requests import structures
+from pycurl_requests.adapters.base import BaseAdapter
+
+#: Default maximum size of a `MemoryCache` (in bytes)
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+#: Methods whose responses are cached
+CACHEABLE_METHODS = frozenset({"GET"})
+
+#: Status codes that are cacheable by default (RFC 7231, section 6.1)
+CACHEABLE_STATUS_CODES = frozenset(
+    {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+)
+
+#: Methods that invalidate cached responses for the request URL
+INVALIDATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+#: Request headers that are handled by the caller (so bypass the cache)
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since", "If-Range", "Range")
+
+#: Headers from a 304 response that don't replace the cached response's
+NOT_MODIFIED_EXCLUDED_HEADERS = frozenset(
+    {"content-length", "content-encoding", "transfer-encoding", "content-range"}
+)
+
+#: Response directives that allow storing responses to authorized requests
+#: (RFC 7234, section 3.2)
+AUTHORIZED_STORABLE_DIRECTIVES = ("public", "s-maxage", "must-revalidate")
+
+#: Fraction of the time since `Last-Modified` used as a heuristic lifetime
+HEURISTIC_FRACTION = 0.1
+
+
+class CacheEntry(NamedTuple):
+    """A response stored in a cache."""
+
+    url: str
+    status_code: int
+    reason: Optional[str]
+    http_version: Optional[str]
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+    #: Time the request was sent
+    request_time: float
+    #: Time the response was received
+    response_time: float
+    #: Values of request headers named by `Vary`
+    vary: Tuple[Tuple[str, Optional[str]], ...] = ()
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the entry (in bytes)."""
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    def get_header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+
+        return None
+
+    def to_json(self) -> dict:
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "reason": self.reason,
+            "http_version": self.http_version,
+            "headers": self.headers,
+            "request_time": self.request_time,
+            "response_time": self.response_time,
+            "vary": self.vary,
+        }
+
+    @classmethod
+    def from_json(cls, value: dict, body: bytes) -> "CacheEntry":
+        return cls(
+            url=value["url"],
+            status_code=value["status_code"],
+            reason=value["reason"],
+            http_version=value["http_version"],
+            headers=tuple(tuple(h) for h in value["headers"]),
+            body=body,
+            request_time=value["request_time"],
+            response_time=value["response_time"],
+            vary=tuple(tuple(v) for v in value["vary"]),
+        )
+
+
+class BaseCache:
+    """Base class for response caches."""
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    """
+    An in-memory cache that evicts the least recently used entries once
+    `max_size` bytes are stored.
+
+    The cache is thread-safe, so may be shared between adapters.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._entries = collections.OrderedDict()  # type: Dict[str, CacheEntry]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        size = entry.size
+        with self._lock:
+            self._remove(key)
+            if size > self.max_size:
+                # Would evict everything else
+                return
+
+            self._entries[key] = entry
+            self.size += size
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+class FileCache(BaseCache):
+    """
+    A cache that stores each entry as a file in `directory`.
+
+    Entries are written atomically, so the directory may be shared between
+    processes. Entries are only removed when replaced or invalidated.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as f:
+                metadata = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        try:
+            return CacheEntry.from_json(metadata, body)
+        except (KeyError, TypeError):
+            # Corrupt or from an incompatible version
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        fd, path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(entry.to_json()).encode("utf-8"))
+                f.write(b"\n")
+                f.write(entry.body)
+
+            os.replace(path, self._path(key))
+        except BaseException:
+            os.unlink(path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".entry"):
+                os.unlink(os.path.join(self.directory, name))
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".entry"
+        return os.path.join(self.directory, name)
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    Adapter that caches responses of another adapter.
+
+    Fresh responses (according to `Cache-Control`/`Expires`, or a heuristic
+    based on `Last-Modified`) are returned without making a request. Stale
+    responses are revalidated using `If-None-Match` and `If-Modified-Since`,
+    and a `304 Not Modified` response is turned into the cached response.
+
+    Responses returned by this adapter have a `from_cache` attribute.
+    """
+
+    def __init__(
+        self, adapter: Optional[BaseAdapter] = None, cache: Optional[BaseCache] = None
+    ) -> None:
+        """
+        :param adapter: Adapter to send requests with (a new
+            :class:`~pycurl_requests.adapters.PyCurlHttpAdapter` if not set).
+        :param cache: Where to store responses (a new :class:`MemoryCache` if
+            not set).
+        """
+        super().__init__()
+        if adapter is None:
+            from pycurl_requests.adapters.pycurl import PyCurlHttpAdapter
+
+            adapter = PyCurlHttpAdapter()
+
+        self.adapter = adapter
+        self.cache = cache if cache is not None else MemoryCache()
+
+    def send(self, request, stream=False, **kwargs) -> models.Response:
+        method = (request.method or "GET").upper()
+        key = request.url
+        if method not in CACHEABLE_METHODS:
+            response = self.adapter.send(request, stream=stream, **kwargs)
+            if method in INVALIDATING_METHODS and response.status_code < 400:
+                self.cache.delete(key)
+
+            response.from_cache = False
+            return response
+
+        request_cc = parse_cache_control(request.headers.get("Cache-Control"))
+        if (
+            "no-store" in request_cc
+            or kwargs.get("sink") is not None
+            or any(h in request.headers for h in CONDITIONAL_HEADERS)
+        ):
+            response = self.adapter.send(request, stream=stream, **kwargs)
+            response.from_cache = False
+            return response
+
+        now = time.time()
+        entry = self.cache.get(key)
+        if entry is not None and not _vary_matches(entry, request):
+            entry = None
+
+        if entry is not None and is_fresh(entry, request_cc, now):
+            return build_response(entry, request, now)
+
+        conditional = None
+        if entry is not None:
+            conditional = _conditional_request(request, entry)
+
+        request_time = time.time()
+        response = self.adapter.send(conditional or request, stream=stream, **kwargs)
+        response_time = time.time()
+
+        if conditional is not None and response.status_code == 304:
+            entry = _update_entry(entry, response, request_time, response_time)
+            self.cache.set(key, entry)
+            response.close()
+            return build_response(entry, request, response_time)
+
+        response.from_cache = False
+        if response.url != key:
+            # Redirects aren't cached (they may be temporary), so the response
+            # is only stored for the URL that it was redirected to
+            self.cache.delete(key)
+            key = response.url
+
+        if not stream and _is_storable(response, request):
+            self.cache.set(
+                key,
+                CacheEntry(
+                    url=response.url,
+                    status_code=response.status_code,
+                    reason=response.reason,
+                    http_version=response.http_version,
+                    headers=tuple(response.headers.items()),
+                    body=response.content,
+                    request_time=request_time,
+                    response_time=response_time,
+                    vary=_vary_values(response.headers.get("Vary"), request),
+                ),
+            )
+        elif response.status_code < 400:
+            self.cache.delete(key)
+
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+        self.cache.close()
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a `Cache-Control` header into a dictionary of directives."""
+    directives = {}
+    if not value:
+        return directives
+
+    for directive in value.split(","):
+        name, sep, argument = directive.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = argument.strip().strip('"') if sep else None
+
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a timestamp (or `None` if invalid)."""
+    if not value:
+        return None
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        return None
+
+    return date.timestamp()
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[int]:
+    if value is None or not value.isdigit():
+        return None
+
+    return int(value)
+
+
+def get_freshness_lifetime(entry: CacheEntry) -> float:
+    """How long a response is fresh for, in seconds (RFC 7234, section 4.2.1)."""
+    cc = parse_cache_control(entry.get_header("Cache-Control"))
+    max_age = _parse_seconds(cc.get("max-age"))
+    if max_age is not None:
+        return max_age
+
+    date = parse_http_date(entry.get_header("Date")) or entry.response_time
+    expires = entry.get_header("Expires")
+    if expires is not None:
+        # Invalid dates (e.g. "0") mean already expired
+        expires_time = parse_http_date(expires)
+        return expires_time - date if expires_time is not None else 0
+
+    last_modified = parse_http_date(entry.get_header("Last-Modified"))
+    if last_modified is not None and entry.status_code in CACHEABLE_STATUS_CODES:
+        return max(0.0, date - last_modified) * HEURISTIC_FRACTION
+
+    return 0
+
+
+def get_current_age(entry: CacheEntry, now: float) -> float:
+    """Age of a response, in seconds (RFC 7234, section 4.2.3)."""
+    date = parse_http_date(entry.get_header("Date")) or entry.response_time
+    apparent_age = max(0.0, entry.response_time - date)
+    age = _parse_seconds(entry.get_header("Age")) or 0
+    response_delay = entry.response_time - entry.request_time
+    corrected_initial_age = max(apparent_age, age + response_delay)
+
+    return corrected_initial_age + (now - entry.response_time)
+
+
+def is_fresh(entry: CacheEntry, request_cc: Dict[str, Optional[str]], now) -> bool:
+    """Whether a cached response can be used without revalidation."""
+    if "no-cache" in request_cc:
+        return False
+
+    cc = parse_cache_control(entry.get_header("Cache-Control"))
+    if "no-cache" in cc:
+        return False
+
+    age = get_current_age(entry, now)
+    max_age = _parse_seconds(request_cc.get("max-age"))
+    if max_age is not None and age > max_age:
+        return False
+
+    return age < get_freshness_lifetime(entry)
+
+
+def build_response(entry: CacheEntry, request, now: float) -> models.Response:
+    """Build a response from a cache entry."""
+    headers = structures.CaseInsensitiveDict(entry.headers)
+    headers["Age"] = str(int(get_current_age(entry, now)))
+
+    response = models.Response()
+    response.request = request
+    response.status_code = entry.status_code
+    response.reason = entry.reason
+    response.http_version = entry.http_version
+    response.headers = headers
+    response.url = entry.url
+    response.raw = io.BytesIO(entry.body)
+    response.from_cache = True
+
+    return response
+
+
+def _is_storable(response, request) -> bool:
+    if response.status_code not in CACHEABLE_STATUS_CODES:
+        return False
+
+    headers = response.headers
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in cc or headers.get("Vary", "").strip() == "*":
+        return False
+
+    # Entries are keyed on the URL, so would be returned to other users
+    if _is_authorized(request) and not any(
+        d in cc for d in AUTHORIZED_STORABLE_DIRECTIVES
+    ):
+        return False
+
+    # Only worth storing if it can be reused or revalidated
+    return bool(
+        "max-age" in cc
+        or "Expires" in headers
+        or "ETag" in headers
+        or "Last-Modified" in headers
+    )
+
+
+def _is_authorized(request) -> bool:
+    """Whether a request has credentials (as a header, auth or in the URL)."""
+    if "Authorization" in request.headers or getattr(request, "curl_auth", None):
+        return True
+
+    return "@" in urlsplit(request.url).netloc
+
+
+def _vary_values(vary: Optional[str], request) -> Tuple[Tuple[str, Optional[str]], ...]:
+    if not vary:
+        return ()
+
+    names = (name.strip().lower() for name in vary.split(","))
+    return tuple((name, request.headers.get(name)) for name in names if name)
+
+
+def _vary_matches(entry: CacheEntry, request) -> bool:
+    return all(request.headers.get(name) == value for name, value in entry.vary)
+
+
+def _conditional_request(request, entry: CacheEntry):
+    etag = entry.get_header("ETag")
+    last_modified = entry.get_header("Last-Modified")
+    if etag is None and last_modified is None:
+        return None
+
+    conditional = copy.copy(request)
+    conditional.headers = request.headers.copy()
+    if etag is not None:
+        conditional.headers["If-None-Match"] = etag
+    if last_modified is not None:
+        conditional.headers["If-Modified-Since"] = last_modified
+
+    return conditional
+
+
+def _update_entry(
+    entry: CacheEntry, response, request_time: float, response_time: float
+) -> CacheEntry:
+    """Update a cache entry with the headers of a `304 Not Modified` response."""
+    headers = structures.CaseInsensitiveDict(entry.headers)
+    for key, value in response.headers.items():
+        if key.lower() not in NOT_MODIFIED_EXCLUDED_HEADERS:
+            headers[key] = value
+
+    return entry._replace(
+        headers=tuple(headers.items()),
+        request_time=request_time,
+        response_time=response_time,
+    )
@@ -0,0 +1,102 @@
+"""
+Concurrent transfers using `pycurl.CurlMulti`.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import pycurl
+
+DEFAULT_CONCURRENCY = 10
+
+# Maximum time to wait for socket activity
+SELECT_TIMEOUT = 1.0
+
+# Time to sleep if libcurl has no sockets to wait on (e.g. during name resolution)
+IDLE_TIMEOUT = 0.01
+
+
+class CurlMultiDriver:
+    """
+    Drive a number of requests through a single `pycurl.CurlMulti`.
+
+    Requests must provide `curl` (an easy handle with all options set) and a
+    `start` method that is called when the request is added.
+    """
+
+    def __init__(self) -> None:
+        self.multi = pycurl.CurlMulti()
+        self.multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX)
+        self.active = {}
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def add(self, request) -> None:
+        """Add a request to be performed."""
+        request.start()
+        self.multi.add_handle(request.curl)
+        self.active[request.curl] = request
+
+    def remove(self, request) -> None:
+        """Remove a request (whether or not it has completed)."""
+        self.multi.remove_handle(request.curl)
+        del self.active[request.curl]
+
+    def perform(self) -> List[Tuple[object, Optional[pycurl.error]]]:
+        """
+        Perform any pending work without blocking.
+
+        Returns a list of `(request, error)` tuples for requests that have
+        completed (`error` will be `None` if the transfer succeeded).
+        Completed requests are removed from the driver.
+        """
+        while True:
+            ret, _ = self.multi.perform()
+            if ret != pycurl.E_CALL_MULTI_PERFORM:
+                break
+
+        completed = []
+        while True:
+            num_queued, ok_list, err_list = self.multi.info_read()
+            for curl in ok_list:
+                completed.append((self.active[curl], None))
+
+            for curl, errno, errmsg in err_list:
+                completed.append((self.active[curl], pycurl.error(errno, errmsg)))
+
+            if not num_queued:
+                break
+
+        for request, _ in completed:
+            self.remove(request)
+
+        return completed
+
+    def wait(self, timeout: float = SELECT_TIMEOUT) -> None:
+        """Wait for socket activity (or until libcurl needs to be called)."""
+        curl_timeout = self.multi.timeout()
+        if curl_timeout >= 0:
+            timeout = min(timeout, curl_timeout / 1000)
+
+        if timeout <= 0:
+            return
+
+        if any(self.multi.fdset()):
+            self.multi.select(timeout)
+        else:
+            time.sleep(min(timeout, IDLE_TIMEOUT))
+
+    def close(self) -> list:
+        """
+        Abort any active transfers and close the multi handle.
+
+        Returns the list of requests that were aborted.
+        """
+        aborted = list(self.active.values())
+        for request in aborted:
+            self.remove(request)
+
+        self.multi.close()
+
+        return aborted
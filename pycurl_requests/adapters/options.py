@@ -0,0 +1,125 @@
+"""
+Tracking of options set on reused cURL handles.
+"""
+
+from typing import Any
+
+import pycurl
+
+# Marks an option whose value on the handle is unknown
+_UNKNOWN = object()
+
+#: `CURLOPT_SUPPRESS_CONNECT_HEADERS` (libcurl 7.54.0+, not exposed by older PycURL)
+SUPPRESS_CONNECT_HEADERS = getattr(pycurl, "SUPPRESS_CONNECT_HEADERS", 265)
+
+
+def _reset_postfields(curl: pycurl.Curl) -> None:
+    # Release the previous body, then switch back from POST
+    curl.setopt(pycurl.POSTFIELDS, b"")
+    curl.setopt(pycurl.HTTPGET, 1)
+
+
+#: How to restore options that are no longer set (`None` means `unsetopt`)
+RESETS = {
+    pycurl.CUSTOMREQUEST: None,
+    pycurl.NOBODY: 0,
+    pycurl.HTTP_VERSION: pycurl.CURL_HTTP_VERSION_NONE,
+    pycurl.PIPEWAIT: 0,
+    pycurl.HTTPAUTH: pycurl.HTTPAUTH_BASIC,
+    pycurl.USERNAME: None,
+    pycurl.PASSWORD: None,
+    pycurl.HTTPHEADER: None,
+    pycurl.POSTFIELDS: _reset_postfields,
+    pycurl.POSTFIELDSIZE_LARGE: -1,
+    pycurl.UPLOAD: 0,
+    pycurl.READFUNCTION: None,
+    # `READDATA` is implemented by PycURL as a `READFUNCTION`
+    pycurl.READDATA: lambda curl: curl.unsetopt(pycurl.READFUNCTION),
+    pycurl.INFILESIZE_LARGE: -1,
+    pycurl.MAXFILESIZE_LARGE: 0,
+    pycurl.CONNECTTIMEOUT_MS: 0,
+    pycurl.TIMEOUT_MS: 0,
+    pycurl.FOLLOWLOCATION: 0,
+    pycurl.POSTREDIR: 0,
+    pycurl.MAXREDIRS: -1,
+    pycurl.PROXY: None,
+    SUPPRESS_CONNECT_HEADERS: 0,
+    pycurl.VERBOSE: 0,
+    pycurl.DEBUGFUNCTION: None,
+}
+
+#: Options that change the request method, so are always set
+METHOD_OPTIONS = frozenset(
+    {
+        pycurl.NOBODY,
+        pycurl.POSTFIELDS,
+        pycurl.POSTFIELDSIZE_LARGE,
+        pycurl.UPLOAD,
+    }
+)
+
+
+class CurlOptions:
+    """
+    Options to set on a `pycurl.Curl` handle for a single transfer.
+
+    Options are collected using `setopt` (so this can be passed in place of a
+    handle, e.g. to :meth:`~pycurl_requests.auth.CurlAuth.setopts`), then set
+    on the handle by `apply`.
+
+    The options applied to a handle are remembered, so options that were set
+    for the previous transfer but no longer apply are restored to their
+    defaults, and options that haven't changed aren't set again. Options set
+    directly on the handle are left alone.
+    """
+
+    def __init__(self) -> None:
+        self.options = {}
+
+    def __contains__(self, option: int) -> bool:
+        return option in self.options
+
+    def setopt(self, option: int, value: Any) -> None:
+        self.options[option] = value
+
+    def apply(self, curl: pycurl.Curl) -> None:
+        """Set options on `curl`."""
+        previous = getattr(curl, "applied_options", None) or {}
+        options = self.options
+
+        # Until done, assume any option may have been set
+        curl.applied_options = dict.fromkeys(previous.keys() | options.keys(), _UNKNOWN)
+
+        # Restore options first, as they may reset the request method
+        for option in previous:
+            if option not in options:
+                reset(curl, option)
+
+        for option, value in options.items():
+            if option not in METHOD_OPTIONS and _same(
+                previous.get(option, _UNKNOWN), value
+            ):
+                continue
+
+            curl.setopt(option, value)
+
+        curl.applied_options = options
+
+
+def reset(curl: pycurl.Curl, option: int) -> None:
+    """Restore `option` to its default."""
+    default = RESETS.get(option)
+    if default is None:
+        curl.unsetopt(option)
+    elif callable(default):
+        default(curl)
+    else:
+        curl.setopt(option, default)
+
+
+def _same(old, new) -> bool:
+    if old is new:
+        return True
+
+    # Avoid comparing arbitrary objects (e.g. callbacks)
+    return type(old) is type(new) and isinstance(new, (int, str, list)) and old == new
@@ -0,0 +1,138 @@
+"""
+Pool of cURL handles.
+"""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+import pycurl
+
+from pycurl_requests.adapters.share import get_default_share
+
+DEFAULT_POOLSIZE = 10
+DEFAULT_POOLBLOCK = False
+
+
+class CurlPool:
+    """
+    A thread-safe pool of `pycurl.Curl` handles.
+
+    Each handle has its own connection cache, so handles are returned to the
+    pool after use (rather than closed) to keep their connections alive.
+
+    Handles are handed out most-recently-used first, so a single-threaded
+    user will always get the same (warm) handle back.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_POOLSIZE,
+        block: bool = DEFAULT_POOLBLOCK,
+        maxconnects: Optional[int] = None,
+        curl: Optional[pycurl.Curl] = None,
+        share: Optional[pycurl.CurlShare] = None,
+        setup: Optional[Callable[[pycurl.Curl], None]] = None,
+    ) -> None:
+        """
+        :param maxsize: Maximum number of handles to keep in the pool.
+        :param block: Block when no handles are available, rather than
+            creating a temporary handle that is discarded after use.
+        :param maxconnects: Size of the connection cache for each handle
+            (see `CURLOPT_MAXCONNECTS`).
+        :param curl: Existing handle to seed the pool with.
+        :param share: Share to attach to handles (defaults to the default share
+            when sharing is enabled, see :mod:`pycurl_requests.adapters.share`).
+        :param setup: Called with each handle in the pool (including `curl`),
+            e.g. to set options that should apply to every request.
+        """
+        if maxsize < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.maxsize = maxsize
+        self.block = block
+        self.maxconnects = maxconnects
+        self.share = share
+        self.setup = setup
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pool = queue.LifoQueue(maxsize)
+
+        # `None` is a placeholder for a handle that will be created on demand
+        for _ in range(maxsize - 1 if curl else maxsize):
+            self._pool.put(None)
+
+        if curl:
+            self._configure(curl)
+            self._pool.put(curl)
+
+    def get(self, block: Optional[bool] = None) -> pycurl.Curl:
+        """
+        Get a handle from the pool.
+
+        The handle must be returned with `put` once it is no longer in use.
+
+        :param block: Override the pool's blocking behaviour.
+        """
+        if self._closed:
+            return self._new_curl()
+
+        try:
+            curl = self._pool.get(block=self.block if block is None else block)
+        except queue.Empty:
+            # Pool is exhausted, so use an overflow handle
+            curl = None
+
+        return curl or self._new_curl()
+
+    def put(self, curl: pycurl.Curl) -> None:
+        """
+        Return a handle to the pool.
+
+        If the pool is full (or closed) then the handle is closed.
+        """
+        with self._lock:
+            if not self._closed:
+                try:
+                    self._pool.put(curl, block=False)
+                    return
+                except queue.Full:
+                    pass
+
+        curl.close()
+
+    def close(self) -> None:
+        """
+        Close all idle handles in the pool.
+
+        Handles that are currently in use will be closed when returned.
+        """
+        with self._lock:
+            self._closed = True
+
+            while True:
+                try:
+                    curl = self._pool.get(block=False)
+                except queue.Empty:
+                    break
+
+                if curl:
+                    curl.close()
+
+    def _new_curl(self) -> pycurl.Curl:
+        curl = pycurl.Curl()
+        self._configure(curl)
+
+        return curl
+
+    def _configure(self, curl: pycurl.Curl) -> None:
+        if self.maxconnects is not None:
+            curl.setopt(pycurl.MAXCONNECTS, self.maxconnects)
+
+        share = self.share or get_default_share()
+        if share:
+            curl.setopt(pycurl.SHARE, share)
+
+        if self.setup is not None:
+            self.setup(curl)
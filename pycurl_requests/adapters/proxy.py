@@ -0,0 +1,173 @@
+"""
+Proxy selection.
+
+Proxies are configured using a dictionary in the same format as Requests
+(see https://requests.readthedocs.io/en/latest/user/advanced/#proxies).
+The proxy URL is passed to libcurl, so any proxy scheme that libcurl
+supports can be used (e.g. `http://`, `https://`, `socks5://` or
+`socks5h://`).
+
+Connections to proxies (including `CONNECT` tunnels for HTTPS) are kept in
+libcurl's connection cache, so are reused by later requests through the
+same proxy.
+"""
+
+import functools
+import os
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class NoProxy(NamedTuple):
+    """A parsed `no_proxy` list."""
+
+    #: Whether all hosts are excluded (`*`)
+    all: bool
+    #: Excluded domains, as `(domain, port)` (`port` is `None` for any port)
+    hosts: Tuple[Tuple[str, Optional[int]], ...]
+    #: Excluded IP addresses and networks
+    networks: tuple
+
+
+def get_environ_proxies(environ: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """
+    Get proxies from `<scheme>_proxy` environment variables (and `no_proxy`).
+
+    As with `urllib.request.getproxies`, lowercase variables take precedence
+    and `HTTP_PROXY` is ignored when running as a CGI script.
+    """
+    if environ is None:
+        environ = os.environ
+
+    proxies = {}
+    for name, value in environ.items():
+        name = name.lower()
+        if value and name.endswith("_proxy"):
+            proxies[name[:-6]] = value
+
+    if "REQUEST_METHOD" in environ:
+        # `HTTP_PROXY` may have been set from a `Proxy` request header
+        proxies.pop("http", None)
+
+    for name, value in environ.items():
+        if name.endswith("_proxy"):
+            if value:
+                proxies[name[:-6]] = value
+            else:
+                proxies.pop(name[:-6], None)
+
+    if "no" in proxies:
+        proxies["no_proxy"] = proxies.pop("no")
+
+    return proxies
+
+
+def select_proxy(url: str, proxies: Optional[Mapping[str, str]]) -> Optional[str]:
+    """
+    Select the proxy to use for `url` (or `None` to connect directly).
+
+    Keys are tried from most to least specific: `scheme://host`, `scheme`,
+    `all://host` then `all`. Hosts matching `proxies['no_proxy']` are
+    connected to directly.
+    """
+    if not proxies:
+        return None
+
+    scheme = url.split(":", 1)[0].lower()
+    host = port = None
+    if "no_proxy" in proxies or any("://" in key for key in proxies):
+        # Only parse the URL if the host is needed
+        try:
+            parts = urlsplit(url)
+            host, port = parts.hostname, parts.port
+        except ValueError:
+            pass
+
+    if host:
+        keys = (scheme + "://" + host, scheme, "all://" + host, "all")
+    else:
+        keys = (scheme, "all")
+
+    for key in keys:
+        if key in proxies:
+            proxy = proxies[key]
+            break
+    else:
+        return None
+
+    no_proxy = proxies.get("no_proxy")
+    if proxy and no_proxy and host:
+        if port is None:
+            port = DEFAULT_PORTS.get(scheme)
+
+        if should_bypass_proxy(host, port, no_proxy):
+            return None
+
+    return proxy or None
+
+
+def should_bypass_proxy(host: str, port: Optional[int], no_proxy: str) -> bool:
+    """
+    Check whether `host` matches a `no_proxy` list.
+
+    Entries are comma-separated domains (which also match subdomains),
+    optionally with a port, IP addresses, CIDR networks, or `*` to match all
+    hosts.
+    """
+    parsed = parse_no_proxy(no_proxy)
+    if parsed.all:
+        return True
+
+    host = host.lower()
+    for domain, domain_port in parsed.hosts:
+        if (host == domain or host.endswith("." + domain)) and (
+            domain_port is None or domain_port == port
+        ):
+            return True
+
+    if parsed.networks:
+        import ipaddress
+
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+
+        return any(address in network for network in parsed.networks)
+
+    return False
+
+
+@functools.lru_cache(maxsize=32)
+def parse_no_proxy(no_proxy: str) -> NoProxy:
+    """Parse a `no_proxy` list (cached, as it rarely changes)."""
+    # Only needed (and imported) if a `no_proxy` list is used
+    import ipaddress
+
+    match_all = False
+    hosts = []
+    networks = []
+    for entry in no_proxy.split(","):
+        entry = entry.strip().lower()
+        if not entry:
+            continue
+
+        if entry == "*":
+            match_all = True
+            continue
+
+        try:
+            networks.append(ipaddress.ip_network(entry.strip("[]"), strict=False))
+            continue
+        except ValueError:
+            pass
+
+        domain, sep, port = entry.rpartition(":")
+        if sep and port.isdigit():
+            hosts.append((domain.strip("[]").lstrip("*."), int(port)))
+        else:
+            hosts.append((entry.lstrip("*."), None))
+
+    return NoProxy(match_all, tuple(hosts), tuple(networks))
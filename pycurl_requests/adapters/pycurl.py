@@ -2,12 +2,13 @@
 PyCurl adapters.
 """
 
+import collections
 import datetime
-import http.client
-import io
-from io import BytesIO
+import functools
 import logging
-from typing import Optional, Tuple, Union
+import mmap
+import sys
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
 import pycurl
 
@@ -15,13 +16,14 @@ from pycurl_requests import exceptions
 from pycurl_requests import models
 from pycurl_requests import structures
 from pycurl_requests.adapters.base import BaseAdapter
-
-try:
-    from urllib3.util.timeout import Timeout
-except ImportError:
-    # Timeout not supported
-    Timeout = None
-
+from pycurl_requests.adapters.options import CurlOptions, SUPPRESS_CONNECT_HEADERS
+from pycurl_requests.adapters.multi import CurlMultiDriver, DEFAULT_CONCURRENCY
+from pycurl_requests.adapters.pool import CurlPool, DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+from pycurl_requests.adapters.proxy import select_proxy
+from pycurl_requests.adapters.retry import Retry
+from pycurl_requests.adapters.spool import SpooledBuffer, DEFAULT_SPOOL_SIZE
+from pycurl_requests.adapters.stream import StreamingBody
+from pycurl_requests.hooks import dispatch_hook
 
 # For DEBUGFUNCTION callback
 CURLINFO_TEXT = 0
@@ -35,21 +37,73 @@ LOGGER_HEADER_IN = LOGGER.getChild("header_in")
 LOGGER_HEADER_OUT = LOGGER.getChild("header_out")
 DEBUGFUNCTION_LOGGERS = {LOGGER_TEXT, LOGGER_HEADER_IN, LOGGER_HEADER_OUT}
 
-VERSION_INFO = pycurl.version_info()
+
+#: Buffer types that can be sent without copying
+BUFFER_TYPES = (bytearray, memoryview, mmap.mmap)
+
+#: Buffers up to this size are copied rather than streamed
+BUFFER_COPY_THRESHOLD = 64 * 1024
+
+#: Mapping of HTTP versions to `CURLOPT_HTTP_VERSION` values
+HTTP_VERSIONS = {
+    "1.0": pycurl.CURL_HTTP_VERSION_1_0,
+    "1.1": pycurl.CURL_HTTP_VERSION_1_1,
+    # HTTP/2 over TLS (via ALPN), otherwise HTTP/1.1
+    "2": pycurl.CURL_HTTP_VERSION_2TLS,
+    # HTTP/2 without HTTP/1.1 Upgrade (e.g. h2c for local services)
+    "2-prior-knowledge": pycurl.CURL_HTTP_VERSION_2_PRIOR_KNOWLEDGE,
+}
+
+#: Mapping of `CURLINFO_HTTP_VERSION` values to protocol names
+HTTP_VERSION_NAMES = {
+    pycurl.CURL_HTTP_VERSION_1_0: "HTTP/1.0",
+    pycurl.CURL_HTTP_VERSION_1_1: "HTTP/1.1",
+    pycurl.CURL_HTTP_VERSION_2_0: "HTTP/2",
+    getattr(pycurl, "CURL_HTTP_VERSION_3", 30): "HTTP/3",
+}
 
 
 class PyCurlBaseAdapter(BaseAdapter):
     """
     Base adapter for PyCurl.
+
+    Requests are performed using handles from a thread-safe pool (see
+    :class:`~pycurl_requests.adapters.pool.CurlPool`), so an adapter may be
+    shared between threads.
     """
 
-    def __init__(self, curl: pycurl.Curl) -> None:
+    def __init__(
+        self,
+        curl: Optional[pycurl.Curl] = None,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        pool_block: bool = DEFAULT_POOLBLOCK,
+        share: Optional[pycurl.CurlShare] = None,
+        curl_setup: Optional[Callable[[pycurl.Curl], None]] = None,
+    ) -> None:
+        """
+        :param curl: Handle to seed the pool with (a new handle is created if not set).
+        :param pool_connections: Number of connections each handle keeps alive.
+        :param pool_maxsize: Maximum number of handles to keep in the pool.
+        :param pool_block: Block when no handles are available.
+        :param share: Share for the pool's handles (see :func:`~pycurl_requests.adapters.share.create_share`).
+        :param curl_setup: Called with each of the pool's handles (options set
+            directly on `curl` only apply to that handle).
+        """
         super().__init__()
         self.curl = curl or pycurl.Curl()
+        self.pool = CurlPool(
+            maxsize=pool_maxsize,
+            block=pool_block,
+            maxconnects=pool_connections,
+            curl=self.curl,
+            share=share,
+            setup=curl_setup,
+        )
 
     def close(self) -> None:
-        if self.curl:
-            self.curl.close()
+        if self.pool:
+            self.pool.close()
 
         self.curl = None
 
@@ -61,10 +115,68 @@ class PyCurlHttpAdapter(PyCurlBaseAdapter):
     Usage::
       >>> import pycurl_requests as requests
       >>> s = requests.Session()
-      >>> a = requests.adapters.HTTPAdapter(max_retries=3)
+      >>> a = requests.adapters.HTTPAdapter(pool_maxsize=32, max_retries=3)
       >>> s.mount('http://', a)
+
+    HTTP/2 can be negotiated using the `http_version` argument::
+      >>> a = PyCurlHttpAdapter(http_version='2')
+      >>> s.mount('https://', a)
     """
 
+    def __init__(
+        self,
+        curl: Optional[pycurl.Curl] = None,
+        *,
+        http_version: Optional[str] = None,
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+        max_body_size: Optional[int] = None,
+        max_retries: Union[Retry, int, None] = None,
+        **kwargs
+    ) -> None:
+        """
+        :param curl: Handle to seed the pool with (a new handle is created if not set).
+        :param http_version: HTTP version to use (`'1.0'`, `'1.1'`, `'2'` or
+            `'2-prior-knowledge'`), otherwise libcurl's default. Requests
+            sent concurrently will wait to be multiplexed over an existing
+            HTTP/2 connection rather than opening new connections.
+        :param spool_size: Response bodies larger than this many bytes are
+            moved from memory to a temporary file.
+        :param max_body_size: Abort transfers with a response body larger than
+            this many bytes (raising `ContentTooLargeError`).
+        :param max_retries: Number of times to retry a failed request, or a
+            :class:`~pycurl_requests.adapters.retry.Retry` policy. By default
+            requests aren't retried.
+        :param kwargs: See :class:`PyCurlBaseAdapter`.
+        """
+        if http_version is not None:
+            if http_version not in HTTP_VERSIONS:
+                raise ValueError("Unknown HTTP version {!r}".format(http_version))
+
+            if http_version.startswith("2") and not (
+                get_version_info()[4] & pycurl.VERSION_HTTP2
+            ):
+                raise ValueError("libcurl was built without HTTP/2 support")
+
+        super().__init__(curl, **kwargs)
+        self.http_version = http_version
+        self.spool_size = spool_size
+        self.max_body_size = max_body_size
+        self.max_retries = Retry.from_int(max_retries)
+        self.header_cache = HeaderCache()
+
+    def _build_request(self, request, curl, **kwargs) -> "PyCurlRequest":
+        # May be overridden for individual requests
+        kwargs.setdefault("spool_size", self.spool_size)
+        kwargs.setdefault("max_body_size", self.max_body_size)
+
+        return PyCurlRequest(
+            request,
+            curl=curl,
+            http_version=self.http_version,
+            header_cache=self.header_cache,
+            **kwargs
+        )
+
     def send(
         self,
         request,
@@ -75,20 +187,283 @@ class PyCurlHttpAdapter(PyCurlBaseAdapter):
         proxies=None,
         **kwargs
     ) -> None:
+        if cert:
+            raise NotImplementedError("cert not supported")
+
+        retries = self.max_retries
+        rewind = get_rewind(request, kwargs.get("sink")) if retries.enabled else None
+        while True:
+            try:
+                response = self._send_once(
+                    request, stream=stream, timeout=timeout, proxies=proxies, **kwargs
+                )
+            except exceptions.RequestException as e:
+                retries = self._next_retry(retries, request, rewind, error=e)
+                response = None
+            else:
+                next_retries = self._next_retry(
+                    retries, request, rewind, response=response
+                )
+                if next_retries is None:
+                    return response
+
+                retries = next_retries
+                if stream:
+                    # Release the handle for the next attempt
+                    response.close()
+
+            rewind()
+            retries.sleep(response)
+
+    def _send_once(self, request, stream=False, timeout=None, **kwargs):
+        curl = self.pool.get()
+        try:
+            pycurl_request = self._build_request(
+                request, curl, timeout=timeout, stream=stream, **kwargs
+            )
+        except BaseException:
+            self.pool.put(curl)
+            raise
+
+        if stream:
+            return self._send_stream(pycurl_request)
+
+        try:
+            return pycurl_request.send()
+        finally:
+            self.pool.put(curl)
+
+    def _next_retry(
+        self, retries: Retry, request, rewind, response=None, error=None
+    ) -> Optional[Retry]:
+        """
+        Get the `Retry` to use for retrying a failed attempt.
+
+        Returns `None` if `response` should be returned to the caller, and
+        raises `error` if it can't be retried.
+        """
+        if error is not None:
+            if rewind is None:
+                raise error
+
+            return retries.increment(request.method, request.url, error=error)
+
+        if rewind is None or not retries.is_retry(
+            request.method, response.status_code, "Retry-After" in response.headers
+        ):
+            return None
+
+        try:
+            return retries.increment(request.method, request.url, response=response)
+        except exceptions.RetryError:
+            if retries.raise_on_status:
+                raise
+
+            return None
+
+    def _send_stream(self, pycurl_request) -> models.Response:
+        """
+        Send a request, returning as soon as the response headers are received.
+
+        The handle is returned to the pool once the transfer is over (or the
+        response is closed).
+        """
+        try:
+            pycurl_request.setup()
+        except BaseException:
+            self.pool.put(pycurl_request.curl)
+            raise
+
+        body = pycurl_request.response_buffer
+        try:
+            body.start(pycurl_request, release=self.pool.put)
+            if body.done:
+                # Whole body has been buffered
+                response = pycurl_request.finish(body.error)
+                body.release_conn()
+                return response
+
+            response = pycurl_request.finish(complete=False)
+            # Timings are updated (and hooks called) once the body has been read
+            body.on_complete = pycurl_request.complete
+            return response
+        except BaseException:
+            body.release_conn()
+            raise
+
+    async def send_async(
+        self,
+        request,
+        multi,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+        **kwargs
+    ) -> models.Response:
+        """
+        Send a request using an :class:`~pycurl_requests.aio.AsyncCurlMulti`.
+        """
         if stream:
             raise NotImplementedError("stream not supported")
 
         if cert:
             raise NotImplementedError("cert not supported")
 
-        if proxies:
-            raise NotImplementedError("proxies not supported")
+        retries = self.max_retries
+        rewind = get_rewind(request, kwargs.get("sink")) if retries.enabled else None
+        while True:
+            try:
+                response = await self._send_async_once(
+                    request, multi, timeout=timeout, proxies=proxies, **kwargs
+                )
+            except exceptions.RequestException as e:
+                retries = self._next_retry(retries, request, rewind, error=e)
+                response = None
+            else:
+                next_retries = self._next_retry(
+                    retries, request, rewind, response=response
+                )
+                if next_retries is None:
+                    return response
 
-        pycurl_request = PyCurlRequest(
-            request, curl=self.curl, timeout=timeout, **kwargs
-        )
+                retries = next_retries
+
+            rewind()
+            delay = retries.get_sleep_time(response)
+            if delay > 0:
+                # Only needed (and imported) when used with asyncio
+                import asyncio
+
+                await asyncio.sleep(delay)
+
+    async def _send_async_once(self, request, multi, timeout=None, **kwargs):
+        # Never block the event loop waiting for a handle
+        curl = self.pool.get(block=False)
+        try:
+            pycurl_request = self._build_request(
+                request, curl, timeout=timeout, **kwargs
+            )
+            pycurl_request.setup()
+            pycurl_request.start()
+
+            return pycurl_request.finish(await multi.perform(curl))
+        finally:
+            self.pool.put(curl)
+
+    def send_many(
+        self,
+        requests: Iterable[models.PreparedRequest],
+        concurrency=DEFAULT_CONCURRENCY,
+        return_exceptions=False,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+        **kwargs
+    ) -> Iterator[Union[models.Response, exceptions.RequestException]]:
+        """
+        Send many requests concurrently, yielding responses as they complete.
+
+        Up to `concurrency` transfers are driven by a single `pycurl.CurlMulti`.
+        Responses are yielded in order of completion, so use `Response.request`
+        to match a response with its request.
+
+        :param requests: Prepared requests to send (consumed lazily).
+        :param concurrency: Maximum number of concurrent transfers.
+        :param return_exceptions: Yield exceptions rather than raising them.
+
+        Failed requests are not retried.
+        """
+        if stream:
+            raise NotImplementedError("stream not supported")
+
+        if cert:
+            raise NotImplementedError("cert not supported")
 
-        return pycurl_request.send()
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        pending = iter(requests)
+        driver = CurlMultiDriver()
+        # Requests that have completed, but haven't been yielded yet
+        completed = collections.deque()
+        try:
+            while True:
+                # Keep the multi handle topped up with transfers
+                while len(driver) < concurrency:
+                    request = next(pending, None)
+                    if request is None:
+                        break
+
+                    curl = self.pool.get(block=False)
+                    try:
+                        pycurl_request = self._build_request(
+                            request, curl, timeout=timeout, proxies=proxies, **kwargs
+                        )
+                        pycurl_request.setup()
+                    except exceptions.RequestException as e:
+                        self.pool.put(curl)
+                        if not return_exceptions:
+                            raise
+
+                        e.request = e.request or request
+                        yield e
+                        continue
+                    except BaseException:
+                        self.pool.put(curl)
+                        raise
+
+                    driver.add(pycurl_request)
+
+                if not driver:
+                    break
+
+                completed.extend(driver.perform())
+                while completed:
+                    pycurl_request, error = completed.popleft()
+                    try:
+                        result = pycurl_request.finish(error)
+                    except exceptions.RequestException as e:
+                        if not return_exceptions:
+                            raise
+
+                        result = e
+                    finally:
+                        self.pool.put(pycurl_request.curl)
+
+                    yield result
+
+                driver.wait()
+        finally:
+            # e.g. the generator was closed before everything was yielded
+            for pycurl_request, _ in completed:
+                self.pool.put(pycurl_request.curl)
+
+            for pycurl_request in driver.close():
+                self.pool.put(pycurl_request.curl)
+
+
+class HTTPAdapter(PyCurlHttpAdapter):
+    """
+    HTTP adapter with the same signature as `requests.adapters.HTTPAdapter`.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        max_retries: Union[Retry, int, None] = 0,
+        pool_block: bool = DEFAULT_POOLBLOCK,
+    ) -> None:
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
 
 
 class PyCurlRequest:
@@ -99,27 +474,39 @@ class PyCurlRequest:
         curl=None,
         timeout=None,
         allow_redirects=True,
-        max_redirects=-1
+        max_redirects=-1,
+        stream=False,
+        sink=None,
+        spool_size=DEFAULT_SPOOL_SIZE,
+        max_body_size=None,
+        http_version=None,
+        header_cache=None,
+        proxies=None
     ):
         self.prepared = prepared
         self.curl = curl or pycurl.Curl()
         self.timeout = timeout
         self.allow_redirects = allow_redirects
         self.max_redirects = max_redirects
+        self.max_body_size = max_body_size
+        self.http_version = http_version
+        self.header_cache = header_cache or HeaderCache()
+        self.proxies = proxies
+        self.proxy = None  # type: Optional[str]
 
         if timeout is not None:
             if isinstance(timeout, (int, float)):
                 self.connect_timeout, self.read_timeout = timeout, timeout
-            elif Timeout and isinstance(timeout, Timeout):
+            elif is_urllib3_timeout(timeout):
                 timeout.start_connect()
                 self.connect_timeout = (
                     0
-                    if timeout.connect_timeout is Timeout.DEFAULT_TIMEOUT
+                    if timeout.connect_timeout is timeout.DEFAULT_TIMEOUT
                     else timeout.connect_timeout
                 )
                 self.read_timeout = (
                     0
-                    if timeout.read_timeout is Timeout.DEFAULT_TIMEOUT
+                    if timeout.read_timeout is timeout.DEFAULT_TIMEOUT
                     else timeout.read_timeout
                 )
             else:
@@ -127,38 +514,82 @@ class PyCurlRequest:
         else:
             self.connect_timeout, self.read_timeout = (None, None)
 
-        self.response_buffer = BytesIO()
-        self.reason = None
-        self.headers = http.client.HTTPMessage()
-        self.reset_headers = False
+        if sink is not None:
+            if stream:
+                raise ValueError("sink can't be used with stream=True")
+
+            # Body is written directly to file, rather than buffered in memory
+            self.response_buffer = sink
+            # Position to read the body from once written (if possible)
+            self.body_offset = (
+                sink.tell()
+                if getattr(sink, "seekable", None) and sink.seekable()
+                else None
+            )
+        elif stream:
+            self.response_buffer = StreamingBody()
+            self.body_offset = None
+        else:
+            self.response_buffer = SpooledBuffer(spool_size)
+            self.body_offset = 0
+
+        self.body_reader = None  # type: Optional[BodyReader]
+        self.body_writer = None  # type: Optional[LimitedWriter]
+        self.start_time = None
+        self.header_lines = []  # type: List[bytes]
+        # Whether the final response's headers have been received
+        self.headers_complete = False
+        # Response of a streamed transfer that's still in progress
+        self.response = None  # type: Optional[models.Response]
 
     def header_function(self, line: bytes):
-        if self.reset_headers:
-            self.headers = http.client.HTTPMessage()
-            self.reset_headers = False
+        # Headers are only parsed if the response's headers are accessed
+        if line.startswith(b"HTTP/"):
+            # Status line of a new response (e.g. after a redirect)
+            self.header_lines = [line]
+            self.headers_complete = False
+        elif line != b"\r\n":
+            self.header_lines.append(line)
+        else:
+            self.headers_complete = self._is_final_response()
 
+    def _is_final_response(self) -> bool:
+        """
+        Whether the headers received are for the final response, rather than
+        one that libcurl will follow with another request.
+        """
         try:
-            # Some servers return UTF-8 status
-            line = line.decode("utf-8")
-        except UnicodeDecodeError:
-            # Fall back to latin-1
-            line = line.decode("iso-8859-1")
-
-        if self.reason is None:
-            _, _, reason = line.split(" ", 2)
-            self.reason = reason.strip()
-            return
+            status_code = int(self.header_lines[0].split(None, 2)[1])
+        except (IndexError, ValueError):
+            return True
 
-        if line == "\r\n":
-            self.reset_headers = True
-            return
-        elif ":" not in line:
-            return
+        if status_code < 200:
+            # Informational (e.g. `100 Continue`)
+            return False
+
+        if self.proxy and not can_suppress_connect_headers():
+            # May be the proxy's response to `CONNECT` (so wait for the body)
+            return False
 
-        name, value = line.split(":", 1)
-        self.headers.add_header(name, value.strip())
+        if 300 <= status_code < 400 and self.allow_redirects:
+            return not any(
+                line[:9].lower() == b"location:" for line in self.header_lines[1:]
+            )
+
+        if status_code == 401:
+            # Authentication schemes other than Basic are retried with credentials
+            httpauth = self.options.options.get(pycurl.HTTPAUTH, pycurl.HTTPAUTH_BASIC)
+            return httpauth == pycurl.HTTPAUTH_BASIC
+
+        return True
 
     def send(self):
+        self.setup()
+
+        return self.perform()
+
+    def setup(self):
+        """Set cURL options for this request."""
         try:
             # Avoid urlparse/urlsplit as they only support RFC 3986 compatible URLs
             scheme, _ = self.prepared.url.split(":", 1)
@@ -167,94 +598,238 @@ class PyCurlRequest:
                 "Missing scheme for {!r}".format(self.prepared.url)
             )
 
-        supported_protocols = VERSION_INFO[8]
+        supported_protocols = get_version_info()[8]
         if scheme.lower() not in supported_protocols:
             raise exceptions.InvalidSchema(
                 "Unsupported scheme for {!r}".format(self.prepared.url)
             )
 
+        # Only options that differ from the previous request are set
+        options = self.options = CurlOptions()
+
         # Request
-        self.curl.setopt(pycurl.URL, self.prepared.url)
+        options.setopt(pycurl.URL, self.prepared.url)
 
         if self.prepared.method:
-            self.curl.setopt(pycurl.CUSTOMREQUEST, self.prepared.method)
+            options.setopt(pycurl.CUSTOMREQUEST, self.prepared.method)
 
         if self.prepared.method == "HEAD":
-            self.curl.setopt(pycurl.NOBODY, 1)
+            options.setopt(pycurl.NOBODY, 1)
+
+        if self.http_version is not None:
+            options.setopt(pycurl.HTTP_VERSION, HTTP_VERSIONS[self.http_version])
+            if self.http_version.startswith("2"):
+                # Prefer multiplexing over an existing connection (if any)
+                options.setopt(pycurl.PIPEWAIT, 1)
+
+        if self.proxies is not None:
+            self.proxy = select_proxy(self.prepared.url, self.proxies)
+            # An empty string stops libcurl reading proxies from the environment
+            options.setopt(pycurl.PROXY, self.proxy or "")
+            if self.proxy and can_suppress_connect_headers():
+                # Don't pass the proxy's `CONNECT` response to `header_function`
+                options.setopt(SUPPRESS_CONNECT_HEADERS, 1)
 
         # Automatically decompress downloads
-        self.curl.setopt(pycurl.ACCEPT_ENCODING, "")
+        options.setopt(pycurl.ACCEPT_ENCODING, "")
 
         # HTTP server authentication
         self._prepare_http_auth()
 
-        self.curl.setopt(
-            pycurl.HTTPHEADER, [render_header(h) for h in self.prepared.headers.items()]
-        )
-
-        if self.prepared.body is not None:
-            if isinstance(self.prepared.body, str):
-                body = io.BytesIO(self.prepared.body.encode("iso-8859-1"))
-            elif isinstance(self.prepared.body, bytes):
-                body = io.BytesIO(self.prepared.body)
-            else:
-                body = self.prepared.body
-
-            self.curl.setopt(pycurl.UPLOAD, 1)
-            self.curl.setopt(pycurl.READDATA, body)
-
-        content_length = self.prepared.headers.get("Content-Length")
-        if content_length is not None:
-            self.curl.setopt(pycurl.INFILESIZE_LARGE, int(content_length))
+        headers = self.header_cache.render(self.prepared.headers)
+        self._prepare_body(headers)
+        if headers:
+            # An empty list doesn't clear the previous request's headers
+            options.setopt(pycurl.HTTPHEADER, headers)
 
         # Response
-        self.curl.setopt(pycurl.HEADERFUNCTION, self.header_function)
-        self.curl.setopt(pycurl.WRITEDATA, self.response_buffer)
+        options.setopt(pycurl.HEADERFUNCTION, self.header_function)
+        if self.max_body_size is not None:
+            # libcurl only checks the size of bodies whose length is known
+            self.body_writer = LimitedWriter(self.response_buffer, self.max_body_size)
+            options.setopt(pycurl.WRITEDATA, self.body_writer)
+            options.setopt(pycurl.MAXFILESIZE_LARGE, self.max_body_size)
+        else:
+            options.setopt(pycurl.WRITEDATA, self.response_buffer)
 
         # Options
         if self.connect_timeout is not None:
             timeout = int(self.connect_timeout * 1000)
-            self.curl.setopt(pycurl.CONNECTTIMEOUT_MS, timeout)
+            options.setopt(pycurl.CONNECTTIMEOUT_MS, timeout)
 
         if self.read_timeout is not None:
             timeout = int(self.read_timeout * 1000)
-            self.curl.setopt(pycurl.TIMEOUT_MS, timeout)
+            options.setopt(pycurl.TIMEOUT_MS, timeout)
 
         if self.allow_redirects:
-            self.curl.setopt(pycurl.FOLLOWLOCATION, 1)
-            self.curl.setopt(pycurl.POSTREDIR, pycurl.REDIR_POST_ALL)
-            self.curl.setopt(pycurl.MAXREDIRS, self.max_redirects)
+            options.setopt(pycurl.FOLLOWLOCATION, 1)
+            options.setopt(pycurl.POSTREDIR, pycurl.REDIR_POST_ALL)
+            options.setopt(pycurl.MAXREDIRS, self.max_redirects)
 
         # Logging
         if any((l.isEnabledFor(logging.DEBUG) for l in DEBUGFUNCTION_LOGGERS)):
-            self.curl.setopt(pycurl.VERBOSE, 1)
-            self.curl.setopt(pycurl.DEBUGFUNCTION, debug_function)
+            options.setopt(pycurl.VERBOSE, 1)
+            options.setopt(pycurl.DEBUGFUNCTION, debug_function)
 
-        return self.perform()
+        options.apply(self.curl)
+
+    def _prepare_body(self, headers: list):
+        options = self.options
+        body = self.prepared.body
+        if body is None:
+            return
+
+        if isinstance(body, str):
+            body = body.encode("iso-8859-1")
+        elif isinstance(body, BUFFER_TYPES):
+            view = memoryview(body)
+            if view.nbytes <= BUFFER_COPY_THRESHOLD or not view.c_contiguous:
+                # Cheaper to copy than to stream
+                body = view.tobytes()
+            else:
+                body = BufferReader(view)
+
+        if isinstance(body, bytes):
+            # libcurl reads directly from the `bytes` object (no copy is made)
+            options.setopt(pycurl.POSTFIELDSIZE_LARGE, len(body))
+            options.setopt(pycurl.POSTFIELDS, body)
+
+            if "Content-Type" not in self.prepared.headers:
+                # Don't let libcurl default to `application/x-www-form-urlencoded`
+                headers.append(b"Content-Type:")
+
+            return
+
+        if not hasattr(body, "read"):
+            # An iterable of chunks (sent using chunked encoding)
+            body = IterableReader(body)
+
+        options.setopt(pycurl.UPLOAD, 1)
+        if isinstance(body, BodyReader):
+            self.body_reader = body
+            options.setopt(pycurl.READFUNCTION, body.read)
+        else:
+            options.setopt(pycurl.READDATA, body)
+
+        content_length = self.prepared.headers.get("Content-Length")
+        options.setopt(
+            pycurl.INFILESIZE_LARGE,
+            int(content_length) if content_length is not None else -1,
+        )
 
     def _prepare_http_auth(self):
         if not (hasattr(self.prepared, "curl_auth") and self.prepared.curl_auth):
             return
 
-        self.prepared.curl_auth.setopts(self.curl)
+        self.prepared.curl_auth.setopts(self.options)
 
     def perform(self):
+        self.start()
         try:
-            start_time = datetime.datetime.now(tz=datetime.timezone.utc)
-            try:
-                self.curl.perform()
-            finally:
-                end_time = datetime.datetime.now(tz=datetime.timezone.utc)
-                self.prepared.url = self.curl.getinfo(pycurl.EFFECTIVE_URL)
-                self.response_buffer.seek(0)
-                response = self.build_response(elapsed=end_time - start_time)
+            self.curl.perform()
         except pycurl.error as e:
-            raise exceptions.RequestException.from_pycurl_error(
-                e, request=self.prepared, response=response
-            ) from e
+            return self.finish(e)
+
+        return self.finish()
+
+    def start(self):
+        """Mark the start of the transfer."""
+        self.start_time = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    def finish(self, error: Optional[pycurl.error] = None, complete: bool = True):
+        """
+        Complete the transfer, returning the response.
+
+        If the transfer failed, then `error` is raised as a `RequestException`.
+
+        If `complete` is false (the body of a streamed response is still being
+        received), then `post_perform` hooks are dispatched by :meth:`complete`
+        once the transfer is over.
+        """
+        end_time = datetime.datetime.now(tz=datetime.timezone.utc)
+        if self.body_reader:
+            # Allow the buffer to be resized or closed
+            self.body_reader.close()
+
+        self.prepared.url = self.curl.getinfo(pycurl.EFFECTIVE_URL)
+        if self.body_offset is not None:
+            self.response_buffer.seek(self.body_offset)
+        elif hasattr(self.response_buffer, "flush"):
+            self.response_buffer.flush()
+        response = self.build_response(elapsed=end_time - self.start_time)
+
+        exception = None
+        if self.body_reader and self.body_reader.error is not None:
+            # Transfer was aborted due to an error reading the body
+            exception = self.body_reader.error
+        elif error is not None:
+            exception = self.get_exception(error, response)
+
+        if complete:
+            self._dispatch_post_perform(response, exception)
+        else:
+            self.response = response
+
+        if exception is not None:
+            raise exception from error
 
         return response
 
+    def complete(self, error: Optional[pycurl.error] = None) -> None:
+        """
+        Complete the transfer of a streamed response's body.
+
+        The response's timings are updated and `post_perform` hooks are
+        dispatched.
+        """
+        response, self.response = self.response, None
+        if response is not None:
+            response.timings = get_timings(self.curl)
+
+        exception = None
+        if error is not None:
+            exception = self.get_exception(error, response)
+
+        self._dispatch_post_perform(response, exception)
+
+    def get_exception(self, error: pycurl.error, response):
+        """Get the exception to raise for a failed transfer."""
+        exception = exceptions.RequestException.from_pycurl_error(
+            error, request=self.prepared, response=response
+        )
+        if self.body_writer is not None and self.body_writer.exceeded:
+            # Aborted by `LimitedWriter` (rather than by libcurl)
+            exception = exceptions.ContentTooLargeError(
+                "Response body is larger than {} bytes".format(self.max_body_size),
+                curl_message=exception.curl_message,
+                curl_code=exception.curl_code,
+                request=self.prepared,
+                response=response,
+            )
+        elif self.proxy and type(exception) is exceptions.ConnectionError:
+            # Connections are only made to the proxy
+            exception = exceptions.ProxyError(
+                *exception.args,
+                curl_message=exception.curl_message,
+                curl_code=exception.curl_code,
+                request=self.prepared,
+                response=response
+            )
+
+        return exception
+
+    def _dispatch_post_perform(self, response, exception) -> None:
+        hooks = getattr(self.prepared, "hooks", None)
+        if hooks and hooks.get("post_perform"):
+            dispatch_hook(
+                "post_perform",
+                hooks,
+                self.prepared,
+                response=response,
+                error=exception,
+                timings=response.timings if response else get_timings(self.curl),
+            )
+
     def build_response(self, elapsed=None):
         status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
         if not status_code:
@@ -264,18 +839,194 @@ class PyCurlRequest:
         response.request = self.prepared
         response.elapsed = elapsed
         response.status_code = status_code
-        response.reason = self.reason
-        # Merge headers as allowed by RFC-7230 section 3.3.2
-        response.headers = structures.CaseInsensitiveDict(
-            ((k, ", ".join(self.headers.get_all(k))) for k in self.headers.keys())
+        response.http_version = HTTP_VERSION_NAMES.get(
+            self.curl.getinfo(pycurl.INFO_HTTP_VERSION)
         )
-        response.encoding = get_encoding_from_headers(self.headers)
+        response._header_lines = self.header_lines
+        response.timings = get_timings(self.curl)
         response.url = self.prepared.url
         response.raw = self.response_buffer
 
         return response
 
 
+class BodyReader:
+    """Base class for request body readers used as `READFUNCTION`."""
+
+    #: Exception raised while reading the body (if any)
+    error = None  # type: Optional[BaseException]
+
+    def read(self, size: int):
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class BufferReader(BodyReader):
+    """
+    Reads a buffer (e.g. `bytearray`, `memoryview` or `mmap`) in slices.
+
+    Slices are views of the original buffer, so it is never copied in full.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        self.view = view.cast("B")
+        self.offset = 0
+
+    def read(self, size: int) -> memoryview:
+        """Read up to `size` bytes (used as `READFUNCTION`)"""
+        chunk = self.view[self.offset : self.offset + size]
+        self.offset += len(chunk)
+
+        return chunk
+
+    def close(self) -> None:
+        """Release the underlying buffer."""
+        self.view.release()
+
+
+class IterableReader(BodyReader):
+    """
+    Reads chunks from an iterable (e.g. a generator) as they are needed.
+
+    `str` chunks are encoded as UTF-8. If the iterable raises an exception,
+    then the transfer is aborted and the exception is kept in `error`.
+    """
+
+    def __init__(self, iterable) -> None:
+        self.iterator = iter(iterable)
+        self.chunk = memoryview(b"")
+
+    def read(self, size: int):
+        """Read up to `size` bytes (used as `READFUNCTION`)"""
+        try:
+            # An empty chunk would signal the end of the body to cURL
+            while not self.chunk:
+                chunk = next(self.iterator, None)
+                if chunk is None:
+                    return b""
+
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+
+                self.chunk = memoryview(chunk).cast("B")
+        except Exception as e:
+            self.error = e
+            return pycurl.READFUNC_ABORT
+
+        data, self.chunk = self.chunk[:size], self.chunk[size:]
+        return data
+
+    def close(self) -> None:
+        """Close the iterable (if it's a generator)."""
+        close = getattr(self.iterator, "close", None)
+        if close:
+            close()
+
+
+class LimitedWriter:
+    """
+    Writes the response body to `file`, aborting the transfer once more than
+    `max_size` bytes have been received.
+    """
+
+    def __init__(self, file, max_size: int) -> None:
+        self.file = file
+        self.max_size = max_size
+        self.size = 0
+        #: Whether the transfer was aborted for being too large
+        self.exceeded = False
+
+    def write(self, data: bytes) -> Optional[int]:
+        """Write data from cURL (used as `WRITEFUNCTION`)"""
+        if self.size + len(data) > self.max_size:
+            self.exceeded = True
+            # Fewer bytes than given aborts the transfer
+            return 0
+
+        result = self.file.write(data)
+        if result == pycurl.WRITEFUNC_PAUSE:
+            # cURL will deliver this data again once unpaused
+            return result
+
+        self.size += len(data)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_version_info() -> tuple:
+    """Get `pycurl.version_info()` (only called once it is needed)."""
+    return pycurl.version_info()
+
+
+def can_suppress_connect_headers() -> bool:
+    """Whether libcurl supports `CURLOPT_SUPPRESS_CONNECT_HEADERS`."""
+    return get_version_info()[2] >= 0x073600
+
+
+def is_urllib3_timeout(timeout) -> bool:
+    """Whether `timeout` is a `urllib3.util.timeout.Timeout`."""
+    # Timeouts can only exist if urllib3 was imported, so avoid importing it
+    module = sys.modules.get("urllib3.util.timeout")
+    return module is not None and isinstance(timeout, module.Timeout)
+
+
+def get_timings(curl: pycurl.Curl) -> models.Timings:
+    """Get timings and statistics for the last transfer performed by `curl`."""
+    getinfo = curl.getinfo
+
+    return models.Timings(
+        namelookup=getinfo(pycurl.NAMELOOKUP_TIME_T) / 1e6,
+        connect=getinfo(pycurl.CONNECT_TIME_T) / 1e6,
+        appconnect=getinfo(pycurl.APPCONNECT_TIME_T) / 1e6,
+        pretransfer=getinfo(pycurl.PRETRANSFER_TIME_T) / 1e6,
+        starttransfer=getinfo(pycurl.STARTTRANSFER_TIME_T) / 1e6,
+        total=getinfo(pycurl.TOTAL_TIME_T) / 1e6,
+        redirect=getinfo(pycurl.REDIRECT_TIME_T) / 1e6,
+        redirect_count=getinfo(pycurl.REDIRECT_COUNT),
+        size_download=getinfo(pycurl.SIZE_DOWNLOAD_T),
+        size_upload=getinfo(pycurl.SIZE_UPLOAD_T),
+        speed_download=getinfo(pycurl.SPEED_DOWNLOAD_T),
+        speed_upload=getinfo(pycurl.SPEED_UPLOAD_T),
+        num_connects=getinfo(pycurl.NUM_CONNECTS),
+        primary_ip=getinfo(pycurl.PRIMARY_IP),
+        primary_port=getinfo(pycurl.PRIMARY_PORT),
+    )
+
+
+def get_rewind(request, sink=None) -> Optional[Callable[[], None]]:
+    """
+    Get a function that rewinds the request body and `sink` for a retry.
+
+    Returns `None` if either can't be rewound (e.g. the body is a generator).
+    """
+    body = request.body
+    streams = []
+    if body is not None and not isinstance(body, (str, bytes) + BUFFER_TYPES):
+        streams.append(body)
+
+    if sink is not None:
+        streams.append(sink)
+
+    positions = []
+    for stream in streams:
+        if not (getattr(stream, "seekable", None) and stream.seekable()):
+            return None
+
+        positions.append((stream, stream.tell()))
+
+    def rewind():
+        for stream, position in positions:
+            stream.seek(position)
+
+        if sink is not None:
+            # Discard anything written by the failed attempt
+            sink.truncate()
+
+    return rewind
+
+
 def debug_function(infotype: int, message: bytes):
     """cURL `DEBUGFUNCTION` that writes to logger"""
     if infotype > CURLINFO_HEADER_OUT:
@@ -294,37 +1045,59 @@ def debug_function(infotype: int, message: bytes):
             LOGGER_HEADER_OUT.debug(line)
 
 
-def get_encoding_from_headers(headers: http.client.HTTPMessage) -> Optional[str]:
+def render_header(header: Tuple[Union[str, bytes], Union[str, bytes]]) -> bytes:
     """
-    Return encoding based on HTTP headers.
+    Render HTTP header.
     """
-    charset = headers.get_content_charset()
-    if charset:
-        return charset
-
-    content_type = headers.get("Content-Type")
-    if not content_type:
-        return None
-
-    if content_type.startswith("text/"):
-        return "iso-8859-1"
-
-    if content_type.startswith("application/json"):
-        # Assume UTF-8 based on RFC 4627
-        return "utf-8"
+    key, value = header
 
-    return None
+    return b"%s: %s" % (
+        key if isinstance(key, bytes) else key.encode("iso-8859-1"),
+        value if isinstance(value, bytes) else value.encode("iso-8859-1"),
+    )
 
 
-def render_header(header: Tuple[Union[str, bytes], Union[str, bytes]]) -> bytes:
+class HeaderCache:
     """
-    Render HTTP header.
+    Cache of rendered headers.
+
+    Requests from a Session have headers that are a copy-on-write copy of the
+    Session's headers (see :meth:`CaseInsensitiveDict.copy`). The shared
+    headers are rendered once, so only each request's own headers need to be
+    rendered. Changing the Session's headers results in a new base, and so
+    invalidates the cache.
     """
-    key, value = header
 
-    encoded = bytearray()
-    encoded.extend(key if isinstance(key, bytes) else key.encode("iso-8859-1"))
-    encoded.extend(b": ")
-    encoded.extend(value if isinstance(value, bytes) else value.encode("iso-8859-1"))
+    def __init__(self) -> None:
+        # Base headers and their rendered form
+        self._cached = (None, {})
+
+    def render(self, headers) -> List[bytes]:
+        """Render `headers` for `HTTPHEADER`."""
+        if not isinstance(headers, structures.CaseInsensitiveDict):
+            return [render_header(h) for h in headers.items()]
+
+        base, changes = headers.layers()
+        if base is None:
+            return [render_header(h) for h in headers.items()]
+
+        cached_base, rendered = self._cached
+        if cached_base is not base:
+            rendered = {
+                lowerkey: render_header(header)
+                for lowerkey, header in base.items()
+                if header[1] is not None
+            }
+            self._cached = (base, rendered)
+
+        if not changes:
+            return list(rendered.values())
+
+        rendered = rendered.copy()
+        for lowerkey, header in changes.items():
+            if header is None or header[1] is None:
+                rendered.pop(lowerkey, None)
+            else:
+                rendered[lowerkey] = render_header(header)
 
-    return bytes(encoded)
+        return list(rendered.values())
@@ -0,0 +1,297 @@
+"""
+Retrying failed requests.
+
+Based on the interface of `urllib3.util.retry.Retry`, as used by Requests for
+`HTTPAdapter(max_retries=...)`.
+"""
+
+import time
+from typing import Collection, NamedTuple, Optional, Tuple, Union
+
+import pycurl
+
+from pycurl_requests import exceptions
+
+#: Errors where the request was never sent (so it is always safe to retry)
+CONNECT_ERRORS = frozenset(
+    {
+        pycurl.E_COULDNT_RESOLVE_PROXY,
+        pycurl.E_COULDNT_RESOLVE_HOST,
+        pycurl.E_COULDNT_CONNECT,
+    }
+)
+
+#: Errors where the request may have been sent
+READ_ERRORS = frozenset(
+    {
+        pycurl.E_OPERATION_TIMEDOUT,
+        pycurl.E_GOT_NOTHING,
+        pycurl.E_SEND_ERROR,
+        pycurl.E_RECV_ERROR,
+        pycurl.E_PARTIAL_FILE,
+        pycurl.E_HTTP2,
+        # Not defined by older versions of PycURL
+        getattr(pycurl, "E_HTTP2_STREAM", 92),
+    }
+)
+
+
+class RequestHistory(NamedTuple):
+    method: Optional[str]
+    url: Optional[str]
+    error: Optional[Exception]
+    status: Optional[int]
+
+
+class Retry:
+    """
+    Retry policy.
+
+    Each retry uses a new `Retry` returned by :meth:`increment`, so a policy
+    can be shared between requests.
+
+    :param total: Total number of retries (`None` for no limit, or `False`
+        to disable retries).
+    :param connect: Number of retries for errors connecting to the server.
+    :param read: Number of retries for errors after the request was sent.
+        These are only retried for idempotent methods.
+    :param status: Number of retries for responses in `status_forcelist`.
+    :param allowed_methods: Methods that can be retried after the request
+        was sent (or `None` to retry any method).
+    :param status_forcelist: Status codes to retry.
+    :param backoff_factor: Sleep for `backoff_factor * 2 ** (retries - 1)`
+        seconds between consecutive retries.
+    :param backoff_max: Maximum time to sleep between retries.
+    :param backoff_jitter: Add a random amount up to this many seconds to
+        the backoff.
+    :param raise_on_status: Raise `RetryError` once status retries are
+        exhausted, rather than returning the last response.
+    :param respect_retry_after_header: Retry `RETRY_AFTER_STATUS_CODES`
+        responses with a `Retry-After` header, sleeping for the time given.
+    """
+
+    DEFAULT_ALLOWED_METHODS = frozenset(
+        {"HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"}
+    )
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 429, 503})
+    DEFAULT_BACKOFF_MAX = 120
+
+    def __init__(
+        self,
+        total: Union[int, bool, None] = 10,
+        connect: Optional[int] = None,
+        read: Optional[int] = None,
+        status: Optional[int] = None,
+        allowed_methods: Optional[Collection[str]] = DEFAULT_ALLOWED_METHODS,
+        status_forcelist: Optional[Collection[int]] = None,
+        backoff_factor: float = 0,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        backoff_jitter: float = 0,
+        raise_on_status: bool = True,
+        respect_retry_after_header: bool = True,
+        history: Tuple[RequestHistory, ...] = (),
+    ) -> None:
+        self.total = total
+        self.connect = connect
+        self.read = read
+        self.status = status
+        self.allowed_methods = allowed_methods
+        self.status_forcelist = status_forcelist or set()
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.backoff_jitter = backoff_jitter
+        self.raise_on_status = raise_on_status
+        self.respect_retry_after_header = respect_retry_after_header
+        self.history = history
+
+    @classmethod
+    def from_int(cls, retries: Union["Retry", int, None]) -> "Retry":
+        """Create a `Retry` from an int (or `None` for no retries)."""
+        if isinstance(retries, Retry):
+            return retries
+
+        if retries is None:
+            return cls(0, read=False)
+
+        return cls(retries)
+
+    def new(self, **kwargs) -> "Retry":
+        params = dict(
+            total=self.total,
+            connect=self.connect,
+            read=self.read,
+            status=self.status,
+            allowed_methods=self.allowed_methods,
+            status_forcelist=self.status_forcelist,
+            backoff_factor=self.backoff_factor,
+            backoff_max=self.backoff_max,
+            backoff_jitter=self.backoff_jitter,
+            raise_on_status=self.raise_on_status,
+            respect_retry_after_header=self.respect_retry_after_header,
+            history=self.history,
+        )
+        params.update(kwargs)
+        return type(self)(**params)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any request could be retried."""
+        return self.total is not False and self.total != 0
+
+    def is_retry(self, method: str, status_code: int, has_retry_after=False) -> bool:
+        """Whether a response should be retried."""
+        if not self._is_method_retryable(method):
+            return False
+
+        if status_code in self.status_forcelist:
+            return True
+
+        return bool(
+            self.total
+            and self.respect_retry_after_header
+            and has_retry_after
+            and status_code in self.RETRY_AFTER_STATUS_CODES
+        )
+
+    def is_exhausted(self) -> bool:
+        """Whether retries have been used up."""
+        counts = (self.total, self.connect, self.read, self.status)
+        return any(c is not None and c is not False and c < 0 for c in counts)
+
+    def increment(
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        response=None,
+        error: Optional[exceptions.RequestException] = None,
+    ) -> "Retry":
+        """
+        Return a new `Retry` with the counts updated for a failed attempt.
+
+        Raises `error` if it can't be retried, or `RetryError` if a response
+        can't be retried because retries have been used up.
+        """
+        if self.total is False and error is not None:
+            raise error
+
+        total = self.total
+        if total is not None:
+            total -= 1
+
+        connect, read, status = self.connect, self.read, self.status
+        code = getattr(error, "curl_code", None)
+        if error is None:
+            if status is not None:
+                status -= 1
+        elif code in CONNECT_ERRORS:
+            if connect is False:
+                raise error
+            elif connect is not None:
+                connect -= 1
+        elif code in READ_ERRORS:
+            if read is False or not self._is_method_retryable(method):
+                raise error
+            elif read is not None:
+                read -= 1
+        else:
+            raise error
+
+        history = self.history + (
+            RequestHistory(
+                method,
+                url,
+                error,
+                getattr(response, "status_code", None),
+            ),
+        )
+        retry = self.new(
+            total=total, connect=connect, read=read, status=status, history=history
+        )
+
+        if retry.is_exhausted():
+            if error is not None:
+                raise error
+
+            raise exceptions.RetryError(
+                "Max retries exceeded with url: {} (too many {} error responses)".format(
+                    url, response.status_code
+                ),
+                response=response,
+            )
+
+        return retry
+
+    def get_backoff_time(self) -> float:
+        """Time to sleep before the next retry."""
+        if len(self.history) <= 1:
+            # Retry immediately the first time
+            return 0
+
+        backoff = self.backoff_factor * 2 ** (len(self.history) - 1)
+        if self.backoff_jitter:
+            import random
+
+            backoff += random.random() * self.backoff_jitter
+
+        return max(0, min(self.backoff_max, backoff))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        """Time to sleep based on the response's `Retry-After` header (if any)."""
+        if response is None or response.headers is None:
+            return None
+
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        return parse_retry_after(value)
+
+    def get_sleep_time(self, response=None) -> float:
+        """Time to sleep before retrying."""
+        if self.respect_retry_after_header:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+
+        return self.get_backoff_time()
+
+    def sleep(self, response=None) -> None:
+        """Sleep before retrying."""
+        delay = self.get_sleep_time(response)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _is_method_retryable(self, method: Optional[str]) -> bool:
+        if self.allowed_methods is None:
+            return True
+
+        return method is not None and method.upper() in self.allowed_methods
+
+    def __repr__(self):
+        return (
+            "{cls.__name__}(total={self.total}, connect={self.connect}, "
+            "read={self.read}, status={self.status})"
+        ).format(cls=type(self), self=self)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a `Retry-After` header (either a number of seconds or an HTTP date).
+
+    Returns `None` if the header is invalid.
+    """
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    import email.utils
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        return None
+
+    return max(0.0, date.timestamp() - time.time())
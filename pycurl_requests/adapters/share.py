@@ -0,0 +1,111 @@
+"""
+Sharing data between cURL handles.
+
+See https://curl.se/libcurl/c/libcurl-share.html.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import pycurl
+
+_default_share = None  # type: Optional[pycurl.CurlShare]
+_default_share_options = None  # type: Optional[dict]
+_default_share_pid = None
+_default_share_lock = threading.Lock()
+
+# Default shares inherited from a parent process. They're kept alive, as
+# cleaning them up would close connections that the parent is still using.
+_inherited_shares = []
+
+
+def create_share(
+    dns: bool = True, ssl_session: bool = True, connections: bool = True
+) -> pycurl.CurlShare:
+    """
+    Create a `pycurl.CurlShare` for sharing data between handles.
+
+    PycURL provides the locking required for handles in different threads to
+    use the same share.
+
+    :param dns: Share the DNS cache.
+    :param ssl_session: Share TLS session IDs (allowing session resumption).
+    :param connections: Share the connection cache.
+    """
+    share = pycurl.CurlShare()
+    if dns:
+        share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+
+    if ssl_session:
+        share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+
+    if connections:
+        share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+
+    return share
+
+
+def enable_default_share(
+    dns: bool = True, ssl_session: bool = True, connections: bool = True
+) -> None:
+    """
+    Share data between all handles subsequently created by this library.
+
+    This allows DNS results, TLS sessions and connections to be reused
+    across Sessions and adapters. See :func:`create_share` for parameters.
+    """
+    global _default_share, _default_share_options, _default_share_pid
+
+    with _default_share_lock:
+        _default_share_options = dict(
+            dns=dns, ssl_session=ssl_session, connections=connections
+        )
+        _default_share = create_share(**_default_share_options)
+        _default_share_pid = os.getpid()
+
+
+def disable_default_share() -> None:
+    """
+    Stop sharing data between newly created handles.
+
+    Existing handles continue to use the share until they are closed.
+    """
+    global _default_share, _default_share_options
+
+    with _default_share_lock:
+        _default_share = None
+        _default_share_options = None
+
+
+def get_default_share() -> Optional[pycurl.CurlShare]:
+    """Get the default share (or `None` if sharing is not enabled)."""
+    global _default_share, _default_share_pid
+
+    if _default_share_options is None:
+        return None
+
+    with _default_share_lock:
+        if _default_share_options is not None and _default_share_pid != os.getpid():
+            # Connections must not be shared with the parent after a fork
+            _inherited_shares.append(_default_share)
+            _default_share = create_share(**_default_share_options)
+            _default_share_pid = os.getpid()
+
+        return _default_share
+
+
+def _reinit_lock():
+    global _default_share_lock
+
+    # The lock may have been held by another thread at the time of the fork
+    _default_share_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_lock)
+
+# If PYCURLREQUESTS_SHARE is set to a non-null value, then all handles share
+# DNS, TLS session and connection caches by default.
+if os.getenv("PYCURLREQUESTS_SHARE", None):
+    enable_default_share()
@@ -0,0 +1,119 @@
+"""
+Response bodies that spill to disk.
+"""
+
+import io
+import mmap
+import os
+
+#: Size above which response bodies are moved from memory to a temporary file
+DEFAULT_SPOOL_SIZE = 16 * 1024 * 1024
+
+
+class SpooledBuffer(io.BufferedIOBase):
+    """
+    A buffer that is kept in memory until it grows beyond `max_size` bytes,
+    at which point it is moved to a temporary file.
+
+    Like `BytesIO`, the whole buffer is available from `getvalue` regardless
+    of the current position.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SPOOL_SIZE) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self._file = io.BytesIO()
+        self._rolled = False
+
+    @property
+    def rolled(self) -> bool:
+        """Whether the buffer has been moved to a temporary file."""
+        return self._rolled
+
+    def rollover(self) -> None:
+        """Move the buffer to a temporary file."""
+        if self._rolled:
+            return
+
+        import tempfile
+
+        file = tempfile.TemporaryFile()
+        file.write(self._file.getbuffer())
+        file.seek(self._file.tell())
+
+        self._file.close()
+        self._file = file
+        self._rolled = True
+
+    def write(self, data) -> int:
+        if not self._rolled and self._file.tell() + len(data) > self.max_size:
+            self.rollover()
+
+        return self._file.write(data)
+
+    def getvalue(self) -> bytes:
+        """Get the entire contents of the buffer."""
+        if not self._rolled:
+            return self._file.getvalue()
+
+        position = self._file.tell()
+        try:
+            self._file.seek(0)
+            return self._file.read()
+        finally:
+            self._file.seek(position)
+
+    def getbuffer(self) -> memoryview:
+        """
+        Get a read-only view of the entire buffer without copying.
+
+        If the buffer has been moved to a temporary file, then the file is
+        memory-mapped.
+        """
+        if not self._rolled:
+            # `BytesIO.getvalue` shares its buffer (until it's next written to)
+            return memoryview(self._file.getvalue())
+
+        self._file.flush()
+        if not os.fstat(self._file.fileno()).st_size:
+            # Empty files can't be mapped
+            return memoryview(b"")
+
+        return memoryview(mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self._file.read1(size)
+
+    def readinto(self, b) -> int:
+        return self._file.readinto(b)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def fileno(self) -> int:
+        if not self._rolled:
+            raise io.UnsupportedOperation("buffer is in memory")
+
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
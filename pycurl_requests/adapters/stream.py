@@ -0,0 +1,173 @@
+"""
+Streaming response bodies.
+"""
+
+import io
+from typing import Callable, Optional
+
+import pycurl
+
+from pycurl_requests.adapters.multi import CurlMultiDriver
+
+#: Amount of data to buffer before pausing the transfer
+STREAM_BUFFER_SIZE = 256 * 1024
+
+
+class StreamingBody(io.RawIOBase):
+    """
+    A response body that is read incrementally from an active transfer.
+
+    The transfer is driven by a `CurlMultiDriver` only when more data is
+    needed, and is paused whenever more than `max_buffer_size` bytes are
+    waiting to be read.
+    """
+
+    def __init__(self, max_buffer_size: int = STREAM_BUFFER_SIZE) -> None:
+        super().__init__()
+        self.max_buffer_size = max_buffer_size
+
+        self._buffer = bytearray()
+        self._request = None
+        self._driver = None  # type: Optional[CurlMultiDriver]
+        self._release = None  # type: Optional[Callable[[pycurl.Curl], None]]
+        self._paused = False
+        self._done = False
+        self._error = None  # type: Optional[pycurl.error]
+
+        #: Called with the error (if any) once the transfer is over
+        self.on_complete = (
+            None
+        )  # type: Optional[Callable[[Optional[pycurl.error]], None]]
+
+    def start(self, request, release: Callable[[pycurl.Curl], None]) -> None:
+        """
+        Start the transfer for `request`, returning once the final response's
+        headers have been received (or the transfer is over).
+
+        :param request: `PyCurlRequest` whose options have been set.
+        :param release: Called with the handle once the transfer is over.
+        """
+        self._request = request
+        self._release = release
+        try:
+            self._driver = CurlMultiDriver()
+            self._driver.add(request)
+        except BaseException:
+            driver, self._driver = self._driver, None
+            if driver is not None:
+                driver.close()
+
+            release(request.curl)
+            raise
+
+        self._fill(until_headers=True)
+
+    @property
+    def done(self) -> bool:
+        """Whether the transfer is over."""
+        return self._done
+
+    @property
+    def error(self) -> Optional[pycurl.error]:
+        """Error that caused the transfer to fail (if any)."""
+        return self._error
+
+    def write(self, data: bytes) -> Optional[int]:
+        """Receive data from cURL (used as `WRITEFUNCTION`)"""
+        if len(self._buffer) >= self.max_buffer_size:
+            # cURL will deliver this data again once unpaused
+            self._paused = True
+            return pycurl.WRITEFUNC_PAUSE
+
+        self._buffer.extend(data)
+        return None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        self._fill()
+        self._check()
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        del self._buffer[:n]
+
+        return n
+
+    def read1(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes, with at most one wait for more data."""
+        self._fill()
+        self._check()
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+
+        return data
+
+    def release_conn(self) -> None:
+        """Abort the transfer (if still active) and release the handle."""
+        if self._driver is None:
+            return
+
+        driver, self._driver = self._driver, None
+        try:
+            if not self._done:
+                # Closed before the body was read
+                self._complete(None)
+
+            driver.close()
+        finally:
+            self._release(self._request.curl)
+
+    def close(self) -> None:
+        self.release_conn()
+        super().close()
+
+    def _fill(self, until_headers: bool = False) -> None:
+        """
+        Drive the transfer until there is data to read (or, if `until_headers`,
+        the response's headers have been received) or it completes.
+        """
+        while not self._ready(until_headers):
+            if self._paused:
+                self._paused = False
+                self._request.curl.pause(pycurl.PAUSE_CONT)
+
+            for _, error in self._driver.perform():
+                self._complete(error)
+
+            if self._done and not until_headers:
+                # The rest of the body is buffered, so the handle can be reused
+                # (while starting, it's released once the response is built)
+                self.release_conn()
+                break
+
+            if self._ready(until_headers):
+                break
+
+            self._driver.wait()
+
+    def _ready(self, until_headers: bool) -> bool:
+        return bool(
+            self._buffer
+            or self._done
+            or (until_headers and self._request.headers_complete)
+        )
+
+    def _complete(self, error: Optional[pycurl.error]) -> None:
+        self._done = True
+        self._error = error
+
+        on_complete, self.on_complete = self.on_complete, None
+        if on_complete is not None:
+            on_complete(error)
+
+    def _check(self) -> None:
+        if self._error and not self._buffer:
+            error, self._error = self._error, None
+            raise self._request.get_exception(error, None) from error
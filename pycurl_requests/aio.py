@@ -0,0 +1,193 @@
+"""
+Asyncio support.
+
+Transfers are driven by a `pycurl.CurlMulti` whose sockets are watched by the
+event loop, so any number of requests can be in flight on a single thread.
+
+Usage::
+  >>> from pycurl_requests.aio import AsyncSession
+  >>> async with AsyncSession() as s:
+  ...     r = await s.get('https://example.com')
+"""
+
+import asyncio
+from typing import Optional
+
+import pycurl
+
+from pycurl_requests import adapters
+from pycurl_requests.hooks import dispatch_hook
+from pycurl_requests.models import PreparedRequest, Response
+from pycurl_requests.sessions import Session
+
+
+class AsyncCurlMulti:
+    """
+    A `pycurl.CurlMulti` driven by an asyncio event loop.
+
+    Uses `M_SOCKETFUNCTION` and `M_TIMERFUNCTION` to have libcurl tell us
+    which sockets to watch and when to call it back.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop or asyncio.get_event_loop()
+        self.multi = pycurl.CurlMulti()
+        self.multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX)
+        self.multi.setopt(pycurl.M_SOCKETFUNCTION, self._socket_function)
+        self.multi.setopt(pycurl.M_TIMERFUNCTION, self._timer_function)
+
+        self._futures = {}
+        self._sockets = set()
+        self._timer = None
+
+    async def perform(self, curl: pycurl.Curl) -> Optional[pycurl.error]:
+        """
+        Perform a transfer using `curl`.
+
+        Returns a `pycurl.error` if the transfer failed, otherwise `None`.
+        """
+        future = self.loop.create_future()
+        self._futures[curl] = future
+
+        # libcurl will set a timer to start the transfer
+        self.multi.add_handle(curl)
+        try:
+            return await future
+        finally:
+            if self._futures.pop(curl, None) is not None:
+                # Cancelled before completion
+                self.multi.remove_handle(curl)
+
+    def close(self) -> None:
+        """Abort any active transfers and close the multi handle."""
+        for curl, future in list(self._futures.items()):
+            self.multi.remove_handle(curl)
+            future.cancel()
+
+        self._futures.clear()
+
+        for fd in self._sockets:
+            self.loop.remove_reader(fd)
+            self.loop.remove_writer(fd)
+
+        self._sockets.clear()
+
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        self.multi.close()
+
+    def _socket_function(self, what: int, fd: int, multi, socketp) -> None:
+        """cURL `M_SOCKETFUNCTION` that (un)registers sockets with the event loop"""
+        if what == pycurl.POLL_REMOVE:
+            self.loop.remove_reader(fd)
+            self.loop.remove_writer(fd)
+            self._sockets.discard(fd)
+            return
+
+        self._sockets.add(fd)
+
+        if what & pycurl.POLL_IN:
+            self.loop.add_reader(fd, self._socket_action, fd, pycurl.CSELECT_IN)
+        else:
+            self.loop.remove_reader(fd)
+
+        if what & pycurl.POLL_OUT:
+            self.loop.add_writer(fd, self._socket_action, fd, pycurl.CSELECT_OUT)
+        else:
+            self.loop.remove_writer(fd)
+
+    def _timer_function(self, timeout_ms: int) -> None:
+        """cURL `M_TIMERFUNCTION` that schedules a timeout on the event loop"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if timeout_ms >= 0:
+            self._timer = self.loop.call_later(
+                timeout_ms / 1000, self._socket_action, pycurl.SOCKET_TIMEOUT, 0
+            )
+
+    def _socket_action(self, fd: int, event: int) -> None:
+        while True:
+            ret, _ = self.multi.socket_action(fd, event)
+            if ret != pycurl.E_CALL_MULTI_PERFORM:
+                break
+
+        while True:
+            num_queued, ok_list, err_list = self.multi.info_read()
+            for curl in ok_list:
+                self._complete(curl, None)
+
+            for curl, errno, errmsg in err_list:
+                self._complete(curl, pycurl.error(errno, errmsg))
+
+            if not num_queued:
+                break
+
+    def _complete(self, curl: pycurl.Curl, error: Optional[pycurl.error]) -> None:
+        self.multi.remove_handle(curl)
+        future = self._futures.pop(curl, None)
+        if future and not future.done():
+            future.set_result(error)
+
+
+class AsyncSession(Session):
+    """
+    A Session with awaitable requests.
+
+    All PyCurl transfers for the session share a single `pycurl.CurlMulti` on
+    the current event loop.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._multi = None  # type: Optional[AsyncCurlMulti]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._multi:
+            self._multi.close()
+            self._multi = None
+
+        super().close()
+
+    async def request(self, *args, **kwargs) -> Response:
+        return await super().request(*args, **kwargs)
+
+    async def send(self, request: PreparedRequest, **kwargs) -> Response:
+        adapter = self.get_adapter(request.url)
+        if not isinstance(adapter, adapters.PyCurlHttpAdapter):
+            raise TypeError(
+                "AsyncSession requires a PyCurlHttpAdapter (got {!r})".format(adapter)
+            )
+
+        hooks = request.hooks
+        request = dispatch_hook("pre_send", hooks, request, **kwargs)
+        r = await adapter.send_async(request, self._get_multi(), **kwargs)
+
+        return dispatch_hook("response", hooks, r, **kwargs)
+
+    def send_many(self, requests, **kwargs):
+        raise NotImplementedError("use asyncio.gather with AsyncSession.send")
+
+    def map(self, requests, **kwargs):
+        raise NotImplementedError("use asyncio.gather with AsyncSession.request")
+
+    def _get_multi(self) -> AsyncCurlMulti:
+        loop = asyncio.get_event_loop()
+        if self._multi and self._multi.loop is not loop:
+            # Event loop has changed (e.g. multiple calls to `asyncio.run`)
+            self._multi.close()
+            self._multi = None
+
+        if not self._multi:
+            self._multi = AsyncCurlMulti(loop)
+
+        return self._multi
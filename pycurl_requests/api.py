@@ -1,36 +1,124 @@
+import contextlib
+import os
+import threading
+
 from pycurl_requests import sessions
 
+# If PYCURLREQUESTS_DEFAULT_SESSION is set to a non-null value, then the
+# functions in this module share a process-wide Session (and thus connections)
+# rather than creating a new Session for each request.
+_use_default_session = bool(os.getenv("PYCURLREQUESTS_DEFAULT_SESSION", None))
+_default_session = None
+_default_session_pid = None
+_default_session_lock = threading.Lock()
+
+# Default sessions inherited from a parent process. They're never used, but
+# are kept alive, as cleaning up their handles would close connections that
+# the parent is still using.
+_inherited_sessions = []
+
+
+def use_default_session(enabled=True):
+    """
+    Enable (or disable) the process-wide default Session.
+
+    When enabled, the module-level functions (e.g. `get`) reuse a single
+    Session, so connections are kept alive between calls. The Session is
+    safe to use from multiple threads and is recreated after a `fork`.
+    """
+    global _use_default_session
+
+    with _default_session_lock:
+        _use_default_session = enabled
+        if not enabled:
+            _close_default_session()
+
+
+def _close_default_session():
+    global _default_session
+
+    if _default_session and _default_session_pid == os.getpid():
+        _default_session.close()
+    elif _default_session:
+        _inherited_sessions.append(_default_session)
+
+    _default_session = None
+
+
+def _forget_default_session():
+    """Forget (but don't close) the default session after a fork."""
+    global _default_session, _default_session_lock
+
+    # The parent's handles and connections must not be used by the child
+    if _default_session:
+        _inherited_sessions.append(_default_session)
+
+    _default_session = None
+    _default_session_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_default_session)
+
+
+def _get_default_session():
+    global _default_session, _default_session_pid
+
+    session = _default_session
+    if session and _default_session_pid == os.getpid():
+        return session
+
+    with _default_session_lock:
+        if not _default_session or _default_session_pid != os.getpid():
+            if _default_session:
+                _inherited_sessions.append(_default_session)
+
+            _default_session = sessions.Session()
+            _default_session_pid = os.getpid()
+
+        return _default_session
+
+
+@contextlib.contextmanager
+def _session():
+    if _use_default_session:
+        yield _get_default_session()
+        return
 
-def request(method, url, **kwargs):
     with sessions.Session() as session:
+        yield session
+
+
+def request(method, url, **kwargs):
+    with _session() as session:
         return session.request(method, url, **kwargs)
 
 
 def head(url, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.head(url, **kwargs)
 
 
 def get(url, params=None, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.get(url, params=params, **kwargs)
 
 
 def post(url, data=None, json=None, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.post(url, data=data, json=json, **kwargs)
 
 
 def put(url, data=None, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.put(url, data=data, **kwargs)
 
 
 def patch(url, data=None, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.patch(url, data=data, **kwargs)
 
 
 def delete(url, params=None, **kwargs):
-    with sessions.Session() as session:
+    with _session() as session:
         return session.delete(url, params=params, **kwargs)
@@ -2,6 +2,7 @@
 #   - Replaced RequestException with custom implementation for PycURL-Requests
 #   - Removed dependency on `urllib3.exceptions`
 #   - Removed UTF-8 coding header comment
+#   - Added ContentTooLargeError
 #
 # It was originally released under the following licence:
 # ```
@@ -132,6 +133,10 @@ class ContentDecodingError(RequestException):
     """Failed to decode response content"""
 
 
+class ContentTooLargeError(RequestException):
+    """The response body was larger than the maximum allowed size."""
+
+
 class StreamConsumedError(RequestException, TypeError):
     """The content for this response was already consumed"""
 
@@ -177,9 +182,12 @@ PYCURL_ERROR_MAPPING = {
     pycurl.E_INTERFACE_FAILED: ConnectionError,
     pycurl.E_TOO_MANY_REDIRECTS: TooManyRedirects,
     pycurl.E_GOT_NOTHING: ConnectionError,
+    pycurl.E_FILESIZE_EXCEEDED: ContentTooLargeError,
     pycurl.E_PEER_FAILED_VERIFICATION: SSLError,
     pycurl.E_SSL_CACERT: SSLError,
     pycurl.E_SSL_ISSUER_ERROR: SSLError,
     pycurl.E_SSL_PINNEDPUBKEYNOTMATCH: SSLError,
     pycurl.E_SSL_INVALIDCERTSTATUS: SSLError,
+    # `CURLE_PROXY` (libcurl 7.73.0+)
+    getattr(pycurl, "E_PROXY", 97): ProxyError,
 }
@@ -0,0 +1,60 @@
+# This file is taken from Requests v2.25.0 with the following modifications:
+#   - Removed UTF-8 coding header comment
+#   - Added `pre_send` and `post_perform` hooks
+#
+# It was originally released under the following licence:
+# ```
+# Copyright 2019 Kenneth Reitz
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        https://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+# ```
+
+"""
+requests.hooks
+~~~~~~~~~~~~~~
+
+This module provides the capabilities for the Requests hooks system.
+
+Available hooks:
+
+``response``:
+    The response generated from a Request.
+
+``pre_send``:
+    The PreparedRequest, just before it is sent by a Session.
+
+``post_perform``:
+    The PreparedRequest, once each cURL transfer has finished (including
+    failed transfers and retries). Called with ``response``, ``error`` and
+    ``timings`` keyword arguments.
+"""
+
+HOOKS = ["response", "pre_send", "post_perform"]
+
+
+def default_hooks():
+    return {event: [] for event in HOOKS}
+
+
+def dispatch_hook(key, hooks, hook_data, **kwargs):
+    """Dispatches a hook dictionary on a given piece of data."""
+    hooks = hooks or {}
+    hooks = hooks.get(key)
+    if hooks:
+        if hasattr(hooks, "__call__"):
+            hooks = [hooks]
+        for hook in hooks:
+            _hook_data = hook(hook_data, **kwargs)
+            if _hook_data is not None:
+                hook_data = _hook_data
+    return hook_data
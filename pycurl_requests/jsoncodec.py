@@ -0,0 +1,225 @@
+"""
+Pluggable JSON codecs.
+
+Used to encode `json=` request bodies and by `Response.json`. The default
+codec (`'auto'`) decodes using the fastest JSON library installed (orjson,
+msgspec or ujson), falling back to the standard library's `json` module.
+
+Bodies are encoded using the standard library unless a codec is chosen
+explicitly, as orjson and msgspec encode NaN and infinity as `null` and
+accept types that `json` rejects (e.g. `UUID` and `Enum`).
+
+Usage::
+  >>> import pycurl_requests as requests
+  >>> from pycurl_requests import jsoncodec
+  >>> jsoncodec.set_default_codec('json')  # Always use the standard library
+  >>> s = requests.Session()
+  >>> s.json_codec = 'orjson'  # ...except for this session
+"""
+
+import json
+from typing import Any, Union
+
+
+class JSONCodec:
+    """
+    Base class for JSON codecs.
+
+    Codecs that can't represent a value (or parse a document) fall back to
+    the standard library, so results match `json` wherever possible (see
+    each codec for exceptions).
+    """
+
+    #: Name used to select the codec
+    name = None
+
+    #: Whether `loads` accepts any bytes-like object (so the body needn't be copied)
+    accepts_buffer = False
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode `obj` as JSON."""
+        return json.dumps(obj, ensure_ascii=True).encode("ascii")
+
+    def loads(self, data) -> Any:
+        """Decode a JSON document from `bytes` (or a bytes-like object if `accepts_buffer`)."""
+        return json.loads(data)
+
+    def __repr__(self):
+        return "<{} {!r}>".format(type(self).__name__, self.name)
+
+
+class StdlibCodec(JSONCodec):
+    """Codec using the standard library's `json` module."""
+
+    name = "json"
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec using `orjson`.
+
+    Unlike `json`, NaN and infinity are encoded as `null`, and `UUID`,
+    `Enum` and NumPy values are encoded rather than raising `TypeError`.
+    """
+
+    name = "orjson"
+    accepts_buffer = True
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        # Types that `json` doesn't support are passed to it (so raise `TypeError`)
+        self._option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj, option=self._option)
+        except TypeError:
+            # e.g. integers larger than 64-bit
+            return super().dumps(obj)
+
+    def loads(self, data) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            # Raise the standard library's error (or handle e.g. large integers)
+            return super().loads(bytes(data))
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Codec using `msgspec`.
+
+    Unlike `json`, NaN and infinity are encoded as `null`, and types such as
+    `datetime`, `UUID`, `Enum` and dataclasses are encoded rather than
+    raising `TypeError`.
+    """
+
+    name = "msgspec"
+    accepts_buffer = True
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, ValueError, OverflowError):
+            return super().dumps(obj)
+
+    def loads(self, data) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError:
+            return super().loads(bytes(data))
+
+
+class UjsonCodec(JSONCodec):
+    """Codec using `ujson`."""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+    def loads(self, data) -> Any:
+        try:
+            return self._ujson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+
+#: Codecs in order of preference
+CODECS = {c.name: c for c in (OrjsonCodec, MsgspecCodec, UjsonCodec, StdlibCodec)}
+
+
+class AutoCodec(JSONCodec):
+    """
+    Default codec, which decodes using the fastest codec installed, but
+    encodes using the standard library.
+
+    Decoding falls back to the standard library for any document the
+    faster codec rejects, so gives the same results as `json`. Encoding
+    differences (see :class:`OrjsonCodec`) can't be detected without
+    walking the value, so faster codecs are only used to encode when
+    chosen explicitly.
+    """
+
+    name = "auto"
+
+    def __init__(self) -> None:
+        for cls in CODECS.values():
+            try:
+                self._decoder = cls()
+            except ImportError:
+                continue
+            break
+
+        self.accepts_buffer = self._decoder.accepts_buffer
+
+    def loads(self, data) -> Any:
+        return self._decoder.loads(data)
+
+    def __repr__(self):
+        return "<{} {!r} (decoding with {!r})>".format(
+            type(self).__name__, self.name, self._decoder.name
+        )
+
+
+_codecs = {}
+_default = None
+
+
+def get_codec(codec: Union[JSONCodec, str, None] = None) -> JSONCodec:
+    """
+    Get a codec by name (or the default codec if `None`).
+
+    `'auto'` decodes using the fastest codec that is installed (see
+    :class:`AutoCodec`). Raises `ImportError` if the named codec's library
+    isn't installed.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec is None:
+        return _default if _default is not None else get_codec("auto")
+
+    instance = _codecs.get(codec)
+    if instance is not None:
+        return instance
+
+    if codec == "auto":
+        instance = AutoCodec()
+    else:
+        try:
+            cls = CODECS[codec]
+        except KeyError:
+            raise ValueError("Unknown JSON codec {!r}".format(codec)) from None
+        instance = cls()
+
+    _codecs[codec] = instance
+    return instance
+
+
+def set_default_codec(codec: Union[JSONCodec, str, None]) -> None:
+    """Set the codec used when a Session doesn't set `json_codec` (`None` for `'auto'`)."""
+    global _default
+    _default = get_codec(codec) if codec is not None else None
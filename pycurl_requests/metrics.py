@@ -0,0 +1,246 @@
+"""
+In-process request metrics.
+
+A `MetricsCollector` is installed as a `post_perform` hook, so every transfer
+made by a session is counted without changing any call sites. Metrics are
+aggregated per host using fixed-size counters and histograms, so memory use
+doesn't grow with the number of requests.
+
+Usage::
+  >>> import pycurl_requests as requests
+  >>> from pycurl_requests.metrics import MetricsCollector
+  >>> metrics = MetricsCollector()
+  >>> with requests.Session() as s:
+  ...     metrics.install(s)
+  ...     r = s.get('https://example.com')
+  >>> metrics.snapshot()['example.com:443']['requests']
+  1
+"""
+
+import bisect
+import threading
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlsplit
+
+#: Upper bounds of the latency histogram buckets (in seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+#: Maximum number of hosts to track separately
+DEFAULT_MAX_HOSTS = 100
+
+#: Host that metrics are recorded against once `max_hosts` is reached
+OTHER_HOSTS = "<other>"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds.
+
+    Each observation is counted in the first bucket whose upper bound it
+    doesn't exceed, or in a final overflow bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the `q` quantile (0 to 1) as the upper bound of its bucket.
+
+        Returns `None` if there are no observations, or `inf` if the quantile
+        falls in the overflow bucket.
+        """
+        total = self.count
+        if not total:
+            return None
+
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+    def as_dict(self) -> dict:
+        return {
+            "buckets": list(self.bounds) + [float("inf")],
+            "counts": list(self.counts),
+            "sum": self.sum,
+        }
+
+
+class HostMetrics:
+    """Metrics for transfers to a single host."""
+
+    __slots__ = (
+        "requests",
+        "statuses",
+        "errors",
+        "bytes_sent",
+        "bytes_received",
+        "latency",
+    )
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        #: Number of transfers
+        self.requests = 0
+        #: Number of responses by status class (e.g. `"2xx"`)
+        self.statuses = {}  # type: Dict[str, int]
+        #: Number of failed transfers by exception class (e.g. `"ConnectTimeout"`)
+        self.errors = {}  # type: Dict[str, int]
+        #: Total request body bytes sent
+        self.bytes_sent = 0
+        #: Total response body bytes received
+        self.bytes_received = 0
+        #: Total transfer time (in seconds)
+        self.latency = Histogram(buckets)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class MetricsCollector:
+    """
+    Aggregate metrics for transfers, per host.
+
+    Hosts are keyed by `host:port`. Once `max_hosts` hosts have been seen,
+    further hosts are counted under `OTHER_HOSTS`. Error classes and status
+    classes are bounded, so the collector uses constant memory.
+
+    The collector is thread-safe, so it can be shared between sessions.
+
+    :param buckets: Upper bounds of the latency histogram buckets (in seconds).
+    :param max_hosts: Maximum number of hosts to track separately.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.max_hosts = max_hosts
+        self._hosts = {}  # type: Dict[str, HostMetrics]
+        self._lock = threading.Lock()
+
+    def install(self, session) -> None:
+        """Collect metrics for all transfers made by `session`."""
+        hooks = session.hooks["post_perform"]
+        if self not in hooks:
+            hooks.append(self)
+
+    def uninstall(self, session) -> None:
+        """Stop collecting metrics for `session`."""
+        hooks = session.hooks["post_perform"]
+        if self in hooks:
+            hooks.remove(self)
+
+    def __call__(self, request, response=None, error=None, timings=None, **kwargs):
+        """`post_perform` hook."""
+        if timings is not None:
+            latency = timings.total
+            bytes_sent, bytes_received = timings.size_upload, timings.size_download
+        else:
+            elapsed = getattr(response, "elapsed", None)
+            latency = elapsed.total_seconds() if elapsed is not None else 0.0
+            bytes_sent = bytes_received = 0
+
+        self.observe(
+            get_host(request.url),
+            status_code=response.status_code if response is not None else None,
+            error=error,
+            latency=latency,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+        )
+
+    def observe(
+        self,
+        host: str,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        latency: float = 0.0,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record a single transfer."""
+        with self._lock:
+            metrics = self._hosts.get(host)
+            if metrics is None:
+                if len(self._hosts) >= self.max_hosts:
+                    host = OTHER_HOSTS
+
+                metrics = self._hosts.get(host)
+                if metrics is None:
+                    metrics = self._hosts[host] = HostMetrics(self.buckets)
+
+            metrics.requests += 1
+            if status_code is not None:
+                status = "{}xx".format(status_code // 100)
+                metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+            if error is not None:
+                name = type(error).__name__
+                metrics.errors[name] = metrics.errors.get(name, 0) + 1
+
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            metrics.latency.observe(latency)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, dict]:
+        """
+        Get the metrics collected so far, as a dictionary of plain values
+        keyed by host (e.g. for exporting to a metrics system).
+
+        :param reset: Clear the metrics (so the next snapshot only includes
+            later transfers).
+        """
+        with self._lock:
+            snapshot = {host: m.as_dict() for host, m in self._hosts.items()}
+            if reset:
+                self._hosts.clear()
+
+        return snapshot
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._hosts.clear()
+
+
+def get_host(url: str) -> str:
+    """Get the `host:port` of `url`."""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return OTHER_HOSTS
+
+    if port is None:
+        port = DEFAULT_PORTS.get(parts.scheme.lower())
+
+    host = parts.hostname or ""
+    return "{}:{}".format(host, port) if port is not None else host
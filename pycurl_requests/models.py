@@ -2,22 +2,63 @@ import codecs
 import datetime
 import io
 import json as json_
+import mmap
 from collections import abc
 from urllib.parse import urlsplit, urlunsplit, urlencode, parse_qsl, quote
 from io import BytesIO
-from typing import Optional
-
-import chardet
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
 from pycurl_requests.auth import HTTPBasicAuth, CurlAuth
-from pycurl_requests.cookies import RequestsCookieJar
 from pycurl_requests import exceptions
+from pycurl_requests import jsoncodec
 from pycurl_requests import structures
+from pycurl_requests.hooks import default_hooks
 
 DEFAULT_REDIRECT_LIMIT = 30
 
+#: Number of bytes at the start of a body used to detect its encoding
+DETECT_ENCODING_SAMPLE_SIZE = 64 * 1024
+
+#: Byte order marks, longest first (as UTF-32 marks start with UTF-16 marks)
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Sentinel for a value that hasn't been computed yet
+_NOT_LOADED = object()
+
+
+class RequestHooksMixin:
+    def register_hook(self, event, hook):
+        """Properly register a hook."""
+        if event not in self.hooks:
+            raise ValueError(
+                'Unsupported event specified, with event name "{}"'.format(event)
+            )
+
+        if callable(hook):
+            self.hooks[event].append(hook)
+        elif hasattr(hook, "__iter__"):
+            self.hooks[event].extend(h for h in hook if callable(h))
+
+    def deregister_hook(self, event, hook):
+        """
+        Deregister a previously registered hook.
+
+        Returns True if the hook existed, False if not.
+        """
+        try:
+            self.hooks[event].remove(hook)
+            return True
+        except ValueError:
+            return False
 
-class Request:
+
+class Request(RequestHooksMixin):
     def __init__(
         self,
         method=None,
@@ -41,10 +82,11 @@ class Request:
         self.params = params
         self.auth = auth
         self.cookies = cookies
-        self.hooks = hooks
 
-    def deregister_hook(self, event, hook):
-        raise NotImplementedError
+        hooks = {} if hooks is None else hooks
+        self.hooks = default_hooks()
+        for event, hook in hooks.items():
+            self.register_hook(event=event, hook=hook)
 
     def prepare(self):
         prepared = PreparedRequest()
@@ -63,8 +105,45 @@ class Request:
 
         return prepared
 
-    def register_hook(self, event, hook):
-        raise NotImplementedError
+
+class Timings(NamedTuple):
+    """
+    Timings and statistics for a transfer.
+
+    Times are in seconds from the start of the transfer (see
+    https://curl.se/libcurl/c/curl_easy_getinfo.html#TIMES).
+    """
+
+    #: Name resolution completed
+    namelookup: float
+    #: Connected to the server (or proxy)
+    connect: float
+    #: TLS handshake completed
+    appconnect: float
+    #: About to send the request
+    pretransfer: float
+    #: First byte of the response received
+    starttransfer: float
+    #: Transfer completed
+    total: float
+    #: Time spent following redirects
+    redirect: float
+    #: Number of redirects followed
+    redirect_count: int
+    #: Bytes downloaded
+    size_download: int
+    #: Bytes uploaded
+    size_upload: int
+    #: Average download speed (bytes/second)
+    speed_download: int
+    #: Average upload speed (bytes/second)
+    speed_upload: int
+    #: Number of new connections made
+    num_connects: int
+    #: IP address of the last connection
+    primary_ip: str
+    #: Port of the last connection
+    primary_port: int
 
 
 class Response:
@@ -72,23 +151,129 @@ class Response:
         self.request = None  # type: Optional[Request]
         self.elapsed = None  # type: Optional[datetime.timedelta]
         self.status_code = None  # type: Optional[int]
-        self.reason = None  # type: Optional[str]
-        self.headers = None  # type: Optional[structures.CaseInsensitiveDict]
-        self.encoding = None  # type: Optional[str]
+        self.http_version = None  # type: Optional[str]
+        self.timings = None  # type: Optional[Timings]
         self.url = None  # type: Optional[str]
-        self.raw = None  # type: Optional[BytesIO]
+        self.raw = None  # type: Optional[io.IOBase]
+
+        # Raw header lines (starting with the status line), parsed on demand
+        self._header_lines = None  # type: Optional[List[bytes]]
+        self._reason = None  # type: Optional[str]
+        self._headers = None  # type: Optional[structures.CaseInsensitiveDict]
+        self._encoding = _NOT_LOADED
+
+        # Body once read (and values derived from it)
+        self._content = None  # type: Optional[bytes]
+        self._text = None  # type: Optional[Tuple[str, str]]
+        self._json = _NOT_LOADED
+        self._apparent_encoding = _NOT_LOADED
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._reason is None and self._header_lines:
+            self._parse_headers()
+
+        return self._reason
+
+    @reason.setter
+    def reason(self, value: Optional[str]) -> None:
+        self._reason = value
+
+    @property
+    def headers(self) -> Optional[structures.CaseInsensitiveDict]:
+        if self._headers is None and self._header_lines:
+            self._parse_headers()
+
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Optional[structures.CaseInsensitiveDict]) -> None:
+        self._headers = value
+
+    @property
+    def encoding(self) -> Optional[str]:
+        if self._encoding is _NOT_LOADED:
+            headers = self.headers
+            self._encoding = (
+                get_encoding_from_headers(headers) if headers is not None else None
+            )
+
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value: Optional[str]) -> None:
+        self._encoding = value
+
+    def _parse_headers(self) -> None:
+        lines = self._header_lines
+        self._header_lines = None
+        reason, headers = parse_header_lines(lines)
+
+        if self._reason is None:
+            self._reason = reason
+
+        if self._headers is None:
+            self._headers = headers
 
     @property
-    def apparent_encoding(self):
-        return chardet.detect(self.content)["encoding"]
+    def apparent_encoding(self) -> Optional[str]:
+        """
+        Encoding of the body, detected from its content (see
+        :func:`detect_encoding`).
+        """
+        if self._apparent_encoding is _NOT_LOADED:
+            self._apparent_encoding = detect_encoding(self.content_view)
+
+        return self._apparent_encoding
 
     def close(self):
-        # Not implemented
-        pass
+        release_conn = getattr(self.raw, "release_conn", None)
+        if release_conn is not None:
+            # Release the connection of a streamed response
+            release_conn()
+        elif self.raw is not None and not hasattr(self.raw, "getvalue"):
+            # File-backed body (see `Session.download`)
+            self.raw.close()
 
     @property
     def content(self):
-        return self.raw.getvalue()
+        if self._content is None:
+            if hasattr(self.raw, "getvalue"):
+                self._content = self.raw.getvalue()
+                offset = self.raw.tell()
+                if offset:
+                    # e.g. a sink that already held data before the body
+                    self._content = self._content[offset:]
+            else:
+                # Streamed responses can only be read once
+                self._content = self.raw.read()
+
+        return self._content
+
+    @property
+    def content_view(self) -> memoryview:
+        """
+        Read-only view of the response body.
+
+        Unlike `content`, this doesn't copy a buffered body (a body that has
+        been spooled to disk is memory-mapped).
+        """
+        if self._content is None and hasattr(self.raw, "getbuffer"):
+            view = self.raw.getbuffer()
+            if view.readonly:
+                offset = self.raw.tell()
+                return view[offset:] if offset else view
+
+            # e.g. a `BytesIO` sink (`memoryview.toreadonly` needs Python 3.8)
+            view.release()
+
+        return memoryview(self.content)
 
     @property
     def cookies(self):
@@ -115,7 +300,13 @@ class Response:
             if self.encoding and decode_unicode
             else None
         )
-        for chunk in iter(lambda: self.raw.read1(chunk_size), b""):
+        if self._content is not None:
+            # Body has already been read
+            raw = BytesIO(self._content)
+        else:
+            raw = self.raw
+
+        for chunk in iter(lambda: raw.read1(chunk_size), b""):
             if decoder:
                 yield decoder.decode(chunk)
             else:
@@ -151,7 +342,27 @@ class Response:
             yield leftover
 
     def json(self, **kwargs):
-        return json_.loads(self.content, **kwargs)
+        """
+        Decode the body as JSON.
+
+        The result is cached when called without arguments, so the same object
+        is returned by each call. Arguments are passed to `json.loads`,
+        otherwise the request's JSON codec is used (see
+        :mod:`pycurl_requests.jsoncodec`).
+        """
+        if kwargs:
+            return json_.loads(self.content, **kwargs)
+
+        if self._json is _NOT_LOADED:
+            codec = jsoncodec.get_codec(getattr(self.request, "json_codec", None))
+            if codec.accepts_buffer:
+                # Decode directly from the response buffer
+                with self.content_view as view:
+                    self._json = codec.loads(view)
+            else:
+                self._json = codec.loads(self.content)
+
+        return self._json
 
     @property
     def links(self):
@@ -184,19 +395,26 @@ class Response:
 
     @property
     def text(self):
-        return self.content.decode(self.encoding or "ISO-8859-1")
+        # Fall back to detecting the encoding (like Requests)
+        encoding = self.encoding or self.apparent_encoding or "ISO-8859-1"
+        if self._text is None or self._text[0] != encoding:
+            # Encoding may be changed after the body has been decoded
+            self._text = (encoding, self.content.decode(encoding, "replace"))
+
+        return self._text[1]
 
 
-class PreparedRequest:
+class PreparedRequest(RequestHooksMixin):
     def __init__(self):
         self.method = None
         self.url = None
         self.headers = None
         self.body = None
-        self.hooks = None
+        self.hooks = default_hooks()
 
         # Extensions
         self.curl_auth = None
+        self.json_codec = None
 
     @property
     def path_url(self):
@@ -257,13 +475,23 @@ class PreparedRequest:
 
     def prepare_headers(self, headers):
         # NOTE: Only user-defined headers, not those set by libcurl
-        headers = headers or structures.CaseInsensitiveDict()
+        if headers is None:
+            headers = structures.CaseInsensitiveDict()
 
         # Filter out headers with None value
-        header_names = list(headers.keys())
+        if isinstance(headers, structures.CaseInsensitiveDict):
+            # Only the request's own headers, not those shared with a Session
+            _, changes = headers.layers()
+            header_names = [
+                keyval[0]
+                for keyval in changes.values()
+                if keyval is not None and keyval[1] is None
+            ]
+        else:
+            header_names = [name for name, value in headers.items() if value is None]
+
         for name in header_names:
-            if headers[name] is None:
-                del headers[name]
+            del headers[name]
 
         self.headers = headers
 
@@ -272,6 +500,8 @@ class PreparedRequest:
         if "Cookie" in self.headers or cookies is None:
             return
 
+        from pycurl_requests.cookies import RequestsCookieJar
+
         cookiejar = RequestsCookieJar()
         cookiejar.update(cookies)
 
@@ -289,6 +519,8 @@ class PreparedRequest:
             content_length = len(body)
         elif isinstance(body, str):
             content_length = len(body.encode("iso-8859-1"))
+        elif isinstance(body, (bytearray, memoryview, mmap.mmap)):
+            content_length = memoryview(body).nbytes
         elif getattr(body, "seekable", False):
             content_length = body.seek(0, io.SEEK_END)
             body.seek(0)
@@ -298,28 +530,40 @@ class PreparedRequest:
 
     def prepare_body(self, data, files, json=None):
         body = None
+        is_stream = False
 
         if files is not None:
             raise NotImplementedError
         elif data is not None:
-            if isinstance(data, (io.RawIOBase, io.BufferedReader)):
+            if isinstance(data, (str, bytes, bytearray, memoryview, mmap.mmap)):
+                body = data
+            elif isinstance(data, (io.RawIOBase, io.BufferedIOBase)):
                 # It's a file-like object, so can be sent directly
                 body = data
+                is_stream = True
             elif isinstance(data, (abc.Mapping, list, tuple)):
                 self._set_header_default(
                     "Content-Type", "application/x-www-form-urlencoded"
                 )
                 body = urlencode(data)
+            elif isinstance(data, abc.Iterable):
+                # An iterable (e.g. generator) of chunks, read as it is sent
+                body = data
+                is_stream = True
             else:
                 # Assume it's something bytes-compatible
                 body = data
         elif json is not None:
             self._set_header_default("Content-Type", "application/json")
-            body = json_.dumps(json, ensure_ascii=True).encode("ascii")
+            body = jsoncodec.get_codec(self.json_codec).dumps(json)
 
         if "Content-Length" not in self.headers:
             self.prepare_content_length(body)
 
+        if is_stream and "Content-Length" not in self.headers:
+            # Length isn't known in advance
+            self.headers["Transfer-Encoding"] = "chunked"
+
         self.body = body
 
     def _set_header_default(self, key, default):
@@ -345,5 +589,119 @@ class PreparedRequest:
             self.prepare_content_length(self.body)
 
     def prepare_hooks(self, hooks):
-        # FIXME: Not implemented
+        hooks = hooks or []
+        for event in hooks:
+            self.register_hook(event, hooks[event])
+
+
+def parse_header_lines(
+    lines: Iterable[bytes],
+) -> Tuple[str, structures.CaseInsensitiveDict]:
+    """
+    Parse the status line and header lines of a response.
+
+    Returns the reason phrase and headers.
+    """
+    lines = iter(lines)
+    headers = structures.CaseInsensitiveDict()
+
+    status = _decode_header_line(next(lines, b""))
+    parts = status.split(None, 2)
+    reason = parts[2].strip() if len(parts) > 2 else ""
+
+    for line in lines:
+        name, sep, value = _decode_header_line(line).partition(":")
+        if not sep:
+            continue
+
+        value = value.strip()
+        if name in headers:
+            # Merge headers as allowed by RFC-7230 section 3.3.2
+            headers[name] = headers[name] + ", " + value
+        else:
+            headers[name] = value
+
+    return reason, headers
+
+
+def _decode_header_line(line: bytes) -> str:
+    try:
+        # Some servers return UTF-8 status
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        # Fall back to latin-1
+        return line.decode("iso-8859-1")
+
+
+def detect_encoding(
+    data, sample_size: int = DETECT_ENCODING_SAMPLE_SIZE
+) -> Optional[str]:
+    """
+    Detect the encoding of `data` (a bytes-like object) from its content.
+
+    Only the first `sample_size` bytes are examined. ASCII and valid UTF-8
+    (the vast majority of bodies) are recognised directly, otherwise
+    detection uses `charset_normalizer` if installed, or `chardet`.
+    """
+    view = memoryview(data)
+    truncated = view.nbytes > sample_size
+    sample = bytes(view[:sample_size])
+
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        # `bytes.isascii` needs Python 3.7
+        sample.decode("ascii")
+    except UnicodeDecodeError:
         pass
+    else:
+        # The rest of the body may not be ASCII, but UTF-8 is a superset
+        return "utf-8" if truncated else "ascii"
+
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # The sample may end part way through a character
+        if truncated and e.reason == "unexpected end of data":
+            return "utf-8"
+    else:
+        return "utf-8"
+
+    try:
+        import charset_normalizer
+    except ImportError:
+        import chardet
+
+        return chardet.detect(sample)["encoding"]
+
+    match = charset_normalizer.from_bytes(sample).best()
+    return match.encoding if match is not None else None
+
+
+def get_encoding_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Return encoding based on HTTP headers.
+    """
+    content_type = headers.get("Content-Type")
+    if not content_type:
+        return None
+
+    content_type, _, params = content_type.partition(";")
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip("\"'").lower()
+            if charset:
+                return charset
+
+    content_type = content_type.strip().lower()
+    if content_type.startswith("text/"):
+        return "iso-8859-1"
+
+    if content_type.startswith("application/json"):
+        # Assume UTF-8 based on RFC 4627
+        return "utf-8"
+
+    return None
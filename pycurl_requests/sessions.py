@@ -1,12 +1,15 @@
+import itertools
+import os
 from collections import OrderedDict
-from typing import Generator, Optional
+from typing import Generator, Iterable, Iterator, Optional
 
 import pycurl
 from pycurl_requests import adapters
 
+from pycurl_requests.adapters.proxy import get_environ_proxies
 from pycurl_requests.auth import HTTPBasicAuth, CurlAuth
-from pycurl_requests.cookies import RequestsCookieJar
-from pycurl_requests.exceptions import InvalidSchema
+from pycurl_requests.exceptions import InvalidSchema, RequestException
+from pycurl_requests.hooks import default_hooks, dispatch_hook
 from pycurl_requests.models import (
     Request,
     PreparedRequest,
@@ -25,9 +28,9 @@ class Session:
     def __init__(self):
         self.auth = None
         self.cert = None
-        self.cookies = RequestsCookieJar()
+        self._cookies = None
         self.headers = structures.CaseInsensitiveDict()
-        self.hooks = NotImplemented
+        self.hooks = default_hooks()
         self.max_redirects = DEFAULT_REDIRECT_LIMIT
         self.params = {}
         self.proxies = {}
@@ -35,11 +38,20 @@ class Session:
         self.trust_env = True
         self.verify = True
 
+        # Extensions
+        self.json_codec = None
+
+        # Proxies from the environment (read on first use)
+        self._environ_proxies = None
+
         self.curl = pycurl.Curl()
 
+        # A single adapter (and thus handle pool) is shared by both schemes
+        adapter = adapters.PyCurlHttpAdapter(self.curl)
+
         self.adapters = OrderedDict()
-        self.mount("https://", adapters.PyCurlHttpAdapter(self.curl))
-        self.mount("http://", adapters.PyCurlHttpAdapter(self.curl))
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
 
     def __enter__(self):
         return self
@@ -48,11 +60,25 @@ class Session:
         self.close()
 
     def close(self):
-        if self.curl:
-            self.curl.close()
+        for adapter in self.adapters.values():
+            adapter.close()
 
         self.curl = None
 
+    @property
+    def cookies(self):
+        if self._cookies is None:
+            # `http.cookiejar` is slow to import, so only load it when used
+            from pycurl_requests.cookies import RequestsCookieJar
+
+            self._cookies = RequestsCookieJar()
+
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, value):
+        self._cookies = value
+
     def get(self, url, params=None, **kwargs) -> Response:
         return self.request("GET", url, params=params, **kwargs)
 
@@ -92,6 +118,7 @@ class Session:
         verify=None,
         cert=None,
         json=None,
+        **adapter_kwargs,
     ) -> Response:
         request = Request(
             method,
@@ -116,9 +143,37 @@ class Session:
         settings.update(
             self.merge_environment_settings(prepared.url, proxies, stream, verify, cert)
         )
+        settings.update(adapter_kwargs)
 
         return self.send(prepared, **settings)
 
+    def download(self, url, sink, method="GET", **kwargs) -> Response:
+        """
+        Download the response body directly to a file.
+
+        The body is written to `sink` as it arrives rather than being held in
+        memory. The returned response's `raw` is the file, positioned at the
+        start of the body.
+
+        :param sink: Path of a file to create (closed along with the
+            response) or a binary file object to write to.
+
+        Usage::
+          >>> import pycurl_requests as requests
+          >>> with requests.Session() as s:
+          ...     with s.download('https://example.com/large', 'large.bin') as r:
+          ...         r.raise_for_status()
+        """
+        if not isinstance(sink, (str, bytes, os.PathLike)):
+            return self.request(method, url, sink=sink, **kwargs)
+
+        f = open(sink, "w+b")
+        try:
+            return self.request(method, url, sink=f, **kwargs)
+        except BaseException:
+            f.close()
+            raise
+
     def get_adapter(self, url) -> adapters.BaseAdapter:
         for prefix, adapter in self.adapters.items():
             if url.lower().startswith(prefix.lower()):
@@ -130,8 +185,19 @@ class Session:
         raise NotImplementedError
 
     def merge_environment_settings(self, url, proxies, stream, verify, cert) -> dict:
-        # TODO: Read settings from environment
-        return {}
+        # Request proxies take precedence over the session's, then the environment's
+        proxies = _merge_params(self.proxies, proxies)
+        if self.trust_env:
+            if self._environ_proxies is None:
+                # Only read once, rather than for every request
+                self._environ_proxies = get_environ_proxies()
+
+            proxies = _merge_params(self._environ_proxies, proxies)
+
+        return {
+            "proxies": proxies or {},
+            "stream": self.stream if stream is None else stream,
+        }
 
     def mount(self, prefix, adapter):
         """
@@ -147,12 +213,14 @@ class Session:
 
     def prepare_request(self, request: Request) -> PreparedRequest:
         prepared = PreparedRequest()
+        prepared.json_codec = self.json_codec
 
-        headers = structures.CaseInsensitiveDict()
-        for name, value in self.headers.items():
-            headers[name] = value
-        for name, value in (request.headers or {}).items():
-            headers[name] = value
+        if isinstance(self.headers, structures.CaseInsensitiveDict):
+            # Copy-on-write, so only the request's headers are copied
+            headers = self.headers.copy()
+        else:
+            headers = structures.CaseInsensitiveDict(self.headers)
+        headers.update(request.headers or {})
 
         prepared.prepare(
             method=request.method,
@@ -163,9 +231,9 @@ class Session:
             json=request.json,
             params=_merge_params(self.params, request.params),
             auth=request.auth or self.auth,
-            cookies=_merge_params(self.cookies, request.cookies),
-            hooks=NotImplemented,
-        )  # TODO: Merge request with Session
+            cookies=_merge_params(self._cookies, request.cookies),
+            hooks=_merge_hooks(self.hooks, request.hooks),
+        )
 
         return prepared
 
@@ -193,14 +261,107 @@ class Session:
         raise NotImplementedError
 
     def send(self, request: PreparedRequest, **kwargs):
+        hooks = request.hooks
+        request = dispatch_hook("pre_send", hooks, request, **kwargs)
+
         adapter = self.get_adapter(request.url)
+        r = adapter.send(request, **kwargs)
+
+        return dispatch_hook("response", hooks, r, **kwargs)
+
+    def send_many(
+        self, requests: Iterable[PreparedRequest], **kwargs
+    ) -> Iterator[Response]:
+        """
+        Send many prepared requests concurrently.
+
+        Responses are yielded as they complete (see
+        :meth:`~pycurl_requests.adapters.PyCurlHttpAdapter.send_many` for
+        supported arguments). Requests using an adapter without support for
+        concurrent transfers are sent one at a time.
 
-        return adapter.send(request, **kwargs)
+        As with :meth:`request`, proxies and `stream` are merged with the
+        Session's settings (and the environment's).
+        """
+        kwargs.setdefault("max_redirects", self.max_redirects)
+        # Merged once for all requests (proxies are selected for each URL by the adapter)
+        kwargs.update(
+            self.merge_environment_settings(
+                None,
+                kwargs.pop("proxies", None),
+                kwargs.pop("stream", None),
+                kwargs.get("verify"),
+                kwargs.get("cert"),
+            )
+        )
+        return_exceptions = kwargs.get("return_exceptions", False)
+
+        requests = (dispatch_hook("pre_send", r.hooks, r) for r in requests)
+        for adapter, group in itertools.groupby(
+            requests, key=lambda r: self.get_adapter(r.url)
+        ):
+            if hasattr(adapter, "send_many"):
+                for r in adapter.send_many(group, **kwargs):
+                    if isinstance(r, Response):
+                        r = dispatch_hook("response", r.request.hooks, r)
+
+                    yield r
+                continue
+
+            settings = {
+                k: v
+                for k, v in kwargs.items()
+                if k not in ("concurrency", "return_exceptions")
+            }
+            for request in group:
+                try:
+                    r = adapter.send(request, **settings)
+                except RequestException as e:
+                    if not return_exceptions:
+                        raise
+
+                    yield e
+                    continue
+
+                yield dispatch_hook("response", request.hooks, r)
+
+    def map(self, requests: Iterable[Request], **kwargs) -> Iterator[Response]:
+        """
+        Prepare and send many requests concurrently.
+
+        Usage::
+          >>> import pycurl_requests as requests
+          >>> with requests.Session() as s:
+          ...     reqs = (requests.Request('GET', url) for url in urls)
+          ...     for r in s.map(reqs, concurrency=20):
+          ...         print(r.url, r.status_code)
+        """
+        return self.send_many((self.prepare_request(r) for r in requests), **kwargs)
 
     def should_strip_auth(self, old_url, new_url):
         raise NotImplementedError
 
 
+def _merge_hooks(session_hooks, request_hooks):
+    """
+    Merge hooks dictionary.
+
+    Unlike Requests, the Session's hooks are kept when the request has hooks
+    for the same event (and are called first).
+    """
+    if not request_hooks or not any(request_hooks.values()):
+        return session_hooks
+
+    if not session_hooks or not any(session_hooks.values()):
+        return request_hooks
+
+    merged = {event: list(hooks) for event, hooks in session_hooks.items()}
+    for event, hooks in request_hooks.items():
+        merged.setdefault(event, []).extend(hooks)
+
+    return merged
+
+
 def _merge_params(current, new):
     """Merge parameters dictionary"""
     if not new:
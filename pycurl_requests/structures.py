@@ -1,6 +1,7 @@
 # This file is taken from Requests v2.25.0 with the following modifications:
 #   - Removed Python 2 compatibility
 #   - Removed UTF-8 coding header comment
+#   - Reimplemented CaseInsensitiveDict using a copy-on-write dict
 #
 # It was originally released under the following licence:
 # ```
@@ -25,8 +26,50 @@ requests.structures
 Data structures that power Requests.
 """
 
-from collections import OrderedDict
-from collections.abc import MutableMapping, Mapping
+import threading
+from collections.abc import ItemsView, MutableMapping, Mapping, ValuesView
+
+# Marks a key deleted from the base of a copy-on-write dict
+_DELETED = object()
+
+# Serialises `CaseInsensitiveDict.copy`, which may be called on a dict shared
+# between threads (e.g. a Session's headers)
+_copy_lock = threading.Lock()
+
+# Lowercased names of common headers (avoids repeatedly lowercasing them)
+_LOWER_KEYS = {
+    name: name.lower()
+    for name in (
+        "Accept",
+        "Accept-Encoding",
+        "Accept-Language",
+        "Authorization",
+        "Cache-Control",
+        "Connection",
+        "Content-Encoding",
+        "Content-Length",
+        "Content-Type",
+        "Cookie",
+        "Date",
+        "ETag",
+        "Expect",
+        "Host",
+        "If-Modified-Since",
+        "If-None-Match",
+        "Last-Modified",
+        "Location",
+        "Retry-After",
+        "Server",
+        "Set-Cookie",
+        "Transfer-Encoding",
+        "User-Agent",
+        "Vary",
+    )
+}
+
+
+def _lower(key):
+    return _LOWER_KEYS.get(key) or key.lower()
 
 
 class CaseInsensitiveDict(MutableMapping):
@@ -49,10 +92,19 @@ class CaseInsensitiveDict(MutableMapping):
     If the constructor, ``.update``, or equality comparison
     operations are given keys that have equal ``.lower()``s, the
     behavior is undefined.
+
+    ``copy()`` is copy-on-write: the copy shares a read-only base with the
+    original and only records its own changes, so copying and then updating
+    a few keys doesn't copy every item.
     """
 
+    __slots__ = ("_store", "_base")
+
     def __init__(self, data=None, **kwargs):
-        self._store = OrderedDict()
+        # Maps lowercased key to `(key, value)` (or `_DELETED`)
+        self._store = {}
+        # Read-only store shared with copies (if any)
+        self._base = None
         if data is None:
             data = {}
         self.update(data, **kwargs)
@@ -60,23 +112,108 @@ class CaseInsensitiveDict(MutableMapping):
     def __setitem__(self, key, value):
         # Use the lowercased key for lookups, but store the actual
         # key alongside the value.
-        self._store[key.lower()] = (key, value)
+        self._store[_lower(key)] = (key, value)
 
     def __getitem__(self, key):
-        return self._store[key.lower()][1]
+        lower = _lower(key)
+        item = self._store.get(lower)
+        if item is None and self._base is not None:
+            item = self._base.get(lower)
+
+        if item is None or item is _DELETED:
+            raise KeyError(key)
+
+        return item[1]
 
     def __delitem__(self, key):
-        del self._store[key.lower()]
+        lower = _lower(key)
+        if self._base is None or lower not in self._base:
+            del self._store[lower]
+        elif self._store.get(lower) is _DELETED:
+            raise KeyError(key)
+        else:
+            self._store[lower] = _DELETED
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
 
     def __iter__(self):
-        return (casedkey for casedkey, mappedvalue in self._store.values())
+        return (casedkey for casedkey, _ in self._merged().values())
 
     def __len__(self):
-        return len(self._store)
+        return len(self._merged())
+
+    def _merged(self):
+        """Get the store, merged with the base (if any)."""
+        # Read the store before the base, as `copy` replaces them in the
+        # opposite order
+        store = self._store
+        base = self._base
+        if base is None:
+            return store
+
+        merged = {**base, **store}
+        if _DELETED in merged.values():
+            merged = {k: v for k, v in merged.items() if v is not _DELETED}
+
+        return merged
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def update(*args, **kwargs):
+        # Faster than `MutableMapping.update`
+        # (`self` is unpacked so that it can also be used as a keyword)
+        if not args:
+            raise TypeError(
+                "descriptor 'update' of 'CaseInsensitiveDict' object needs an argument"
+            )
+        self, *args = args
+        if len(args) > 1:
+            raise TypeError(
+                "update expected at most 1 argument, got {}".format(len(args))
+            )
+        other = args[0] if args else ()
+
+        if isinstance(other, CaseInsensitiveDict):
+            other = other._merged().values()
+        elif isinstance(other, Mapping):
+            other = other.items()
+        elif hasattr(other, "keys"):
+            other = ((key, other[key]) for key in other.keys())
+
+        store = self._store
+        for key, value in other:
+            store[_lower(key)] = (key, value)
+
+        for key, value in kwargs.items():
+            store[_lower(key)] = (key, value)
+
+    def layers(self):
+        """
+        Get the base shared with copies (if any) and the changes made to it.
+
+        Returns `(base, changes)`. Both map lowercased keys to `(key, value)`
+        tuples, except that `changes` maps deleted keys to `None`. `base` is
+        `None` if this dict doesn't have a shared base.
+        """
+        changes = {
+            lowerkey: (None if keyval is _DELETED else keyval)
+            for lowerkey, keyval in self._store.items()
+        }
+        return self._base, changes
 
     def lower_items(self):
         """Like iteritems(), but with all lowercase keys."""
-        return ((lowerkey, keyval[1]) for (lowerkey, keyval) in self._store.items())
+        return ((lowerkey, keyval[1]) for (lowerkey, keyval) in self._merged().items())
 
     def __eq__(self, other):
         if isinstance(other, Mapping):
@@ -88,12 +225,37 @@ class CaseInsensitiveDict(MutableMapping):
 
     # Copy is required
     def copy(self):
-        return CaseInsensitiveDict(self._store.values())
+        with _copy_lock:
+            if self._store or self._base is None:
+                # Freeze the current items as a base shared with the copy. The
+                # base is replaced first, so concurrent readers see every item.
+                self._base = dict(self._merged())
+                self._store = {}
+
+            base = self._base
+
+        copy = CaseInsensitiveDict()
+        copy._base = base
+        return copy
 
     def __repr__(self):
         return str(dict(self.items()))
 
 
+class _ItemsView(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping._merged().values())
+
+
+class _ValuesView(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return (keyval[1] for keyval in self._mapping._merged().values())
+
+
 class LookupDict(dict):
     """Dictionary lookup object."""
 
@@ -0,0 +1,249 @@
+"""
+Tests for PyCurl adapters.
+"""
+
+import io
+
+import pycurl
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.adapters import PyCurlHttpAdapter
+
+
+def test_http_version(http_server):
+    with requests.Session() as s:
+        s.mount("http://", PyCurlHttpAdapter(http_version="1.1"))
+        response = s.get(http_server.base_url + "/hello")
+
+    # Test server only speaks HTTP/1.0
+    assert response.http_version == "HTTP/1.0"
+    assert response.text == "Hello\nWorld\n"
+
+
+def test_http_version_invalid():
+    with pytest.raises(ValueError):
+        PyCurlHttpAdapter(http_version="0.9")
+
+
+def test_spool_size(http_server):
+    with requests.Session() as s:
+        s.mount("http://", PyCurlHttpAdapter(spool_size=1000))
+        small = s.get(http_server.base_url + "/bytes?n=1000")
+        large = s.get(http_server.base_url + "/bytes?n=100000")
+
+    assert not small.raw.rolled
+    assert large.raw.rolled
+    assert len(small.content) == 1000
+    assert len(large.content) == 100000
+    assert b"".join(large.iter_content(4096)) == large.content
+
+
+def test_max_body_size(http_server):
+    with requests.Session() as s:
+        s.mount("http://", PyCurlHttpAdapter(max_body_size=1000))
+        assert len(s.get(http_server.base_url + "/bytes?n=1000").content) == 1000
+
+        with pytest.raises(requests.exceptions.ContentTooLargeError):
+            s.get(http_server.base_url + "/bytes?n=1001")
+
+        # Can be overridden for a single request
+        response = s.get(http_server.base_url + "/bytes?n=1001", max_body_size=None)
+        assert len(response.content) == 1001
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_max_body_size_unknown_length(http_server, tmp_path, stream):
+    url = http_server.base_url + "/bytes?unknown_length=1&n="
+    with requests.Session() as s:
+        s.mount("http://", PyCurlHttpAdapter(max_body_size=100000))
+        response = s.get(url + "100000", stream=stream)
+        assert len(response.content) == 100000
+
+        # libcurl can't check the size before the body is received
+        with pytest.raises(requests.exceptions.ContentTooLargeError):
+            response = s.get(url + "100001", stream=stream)
+            response.content
+
+        if not stream:
+            with pytest.raises(requests.exceptions.ContentTooLargeError):
+                s.download(url + "100001", tmp_path / "body")
+
+
+def test_limited_writer():
+    from pycurl_requests.adapters.pycurl import LimitedWriter
+
+    writer = LimitedWriter(io.BytesIO(), 10)
+    assert writer.write(b"x" * 6) is None
+    assert writer.write(b"x" * 4) is None
+    assert not writer.exceeded
+    assert writer.write(b"x") == 0
+    assert writer.exceeded
+    assert writer.file.getvalue() == b"x" * 10
+
+    # Paused writes are delivered again, so aren't counted
+    class Paused:
+        def write(self, data):
+            return pycurl.WRITEFUNC_PAUSE
+
+    writer = LimitedWriter(Paused(), 10)
+    assert writer.write(b"x" * 10) == pycurl.WRITEFUNC_PAUSE
+    assert writer.size == 0
+
+
+def test_header_cache():
+    from pycurl_requests.adapters.pycurl import HeaderCache
+    from pycurl_requests.structures import CaseInsensitiveDict
+
+    cache = HeaderCache()
+    defaults = CaseInsensitiveDict({"Accept": "*/*", "X-Foo": "Foo"})
+
+    headers = defaults.copy()
+    headers["x-foo"] = "Bar"
+    headers["X-Bar"] = "Bar"
+    assert cache.render(headers) == [b"Accept: */*", b"x-foo: Bar", b"X-Bar: Bar"]
+    base, rendered = cache._cached
+
+    headers = defaults.copy()
+    del headers["Accept"]
+    assert cache.render(headers) == [b"X-Foo: Foo"]
+    assert cache._cached == (base, rendered)
+
+    # Changing the defaults invalidates the cache
+    defaults["Accept"] = "text/html"
+    assert cache.render(defaults.copy()) == [b"Accept: text/html", b"X-Foo: Foo"]
+    assert cache._cached[0] is not base
+
+
+def test_session_headers_changed(http_server):
+    with requests.Session() as s:
+        s.headers["X-Foo"] = "Foo"
+        assert "X-Foo: Foo" in s.get(http_server.base_url + "/headers").text
+
+        s.headers["X-Foo"] = "Bar"
+        assert "X-Foo: Bar" in s.get(http_server.base_url + "/headers").text
+
+        del s.headers["X-Foo"]
+        assert "X-Foo" not in s.get(http_server.base_url + "/headers").text
+
+
+def test_curl_options():
+    import pycurl
+    from pycurl_requests.adapters.options import CurlOptions
+
+    class Handle:
+        def __init__(self):
+            self.calls = []
+
+        def setopt(self, option, value):
+            self.calls.append(("setopt", option, value))
+
+        def unsetopt(self, option):
+            self.calls.append(("unsetopt", option))
+
+    curl = Handle()
+    options = CurlOptions()
+    options.setopt(pycurl.URL, "http://example.com")
+    options.setopt(pycurl.CUSTOMREQUEST, "HEAD")
+    options.setopt(pycurl.NOBODY, 1)
+    options.apply(curl)
+    assert len(curl.calls) == 3
+
+    curl.calls.clear()
+    options = CurlOptions()
+    options.setopt(pycurl.URL, "http://example.com")
+    options.setopt(pycurl.TIMEOUT_MS, 1000)
+    options.apply(curl)
+    assert curl.calls == [
+        ("unsetopt", pycurl.CUSTOMREQUEST),
+        ("setopt", pycurl.NOBODY, 0),
+        ("setopt", pycurl.TIMEOUT_MS, 1000),
+    ]
+
+
+def test_handle_reuse(http_server):
+    with requests.Session() as s:
+        assert s.head(http_server.base_url + "/hello").content == b""
+        assert s.get(http_server.base_url + "/hello").text == "Hello\nWorld\n"
+
+        s.put(http_server.base_url + "/echo", data=iter([b"Hello"]))
+        response = s.post(http_server.base_url + "/headers", data=b"Hello")
+        assert "Content-Length: 5" in response.text
+        assert "Transfer-Encoding" not in response.text
+
+        response = s.get(http_server.base_url + "/headers", auth=("user", "pass"))
+        assert "Authorization: Basic" in response.text
+        response = s.get(http_server.base_url + "/headers")
+        assert "Authorization" not in response.text
+        assert "Content-Length" not in response.text
+        assert http_server.last_command == "GET"
+
+
+def test_curl_setup(http_server):
+    handles = []
+
+    def setup(curl):
+        handles.append(curl)
+        curl.setopt(pycurl.REFERER, "http://example.invalid/")
+
+    adapter = PyCurlHttpAdapter(curl_setup=setup)
+    assert handles == [adapter.curl]
+    with requests.Session() as s:
+        s.mount("http://", adapter)
+
+        # Hold the seed handle, so that a new handle is created
+        curl = adapter.pool.get()
+        try:
+            response = s.get(http_server.base_url + "/headers")
+        finally:
+            adapter.pool.put(curl)
+
+    assert len(handles) == 2
+    assert "Referer: http://example.invalid/" in response.text
+
+
+def test_send_many_releases_handles(http_server):
+    adapter = PyCurlHttpAdapter(pool_maxsize=4)
+    prepared = [
+        requests.Request("GET", http_server.base_url + "/hello").prepare()
+        for _ in range(8)
+    ]
+
+    # Closed part way through
+    responses = adapter.send_many(prepared, concurrency=4)
+    assert next(responses).text == "Hello\nWorld\n"
+    responses.close()
+    assert adapter.pool._pool.qsize() == 4
+
+    # Error building a request
+    with pytest.raises(TypeError):
+        list(adapter.send_many(prepared, no_such_option=True))
+    assert adapter.pool._pool.qsize() == 4
+
+    adapter.close()
+
+
+def test_share(keepalive_server):
+    from pycurl_requests.adapters.share import create_share
+
+    url = keepalive_server.base_url + "/hello"
+    share = create_share()
+    with requests.Session() as s1, requests.Session() as s2:
+        s1.mount("http://", PyCurlHttpAdapter(share=share))
+        s2.mount("http://", PyCurlHttpAdapter(share=share))
+
+        r = s1.get(url)
+        assert r.text == "Hello\nWorld\n"
+        assert r.timings.num_connects == 1
+
+        # Connection opened by the first adapter is reused by the second
+        r = s2.get(url)
+        assert r.text == "Hello\nWorld\n"
+        assert r.timings.num_connects == 0
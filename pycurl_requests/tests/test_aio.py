@@ -0,0 +1,82 @@
+"""
+Tests for asyncio support.
+"""
+
+import asyncio
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.aio import AsyncSession
+
+
+def run(coro):
+    """Run `coro` in a new event loop (like `asyncio.run`, which needs Python 3.7)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_get(http_server):
+    async def main():
+        async with AsyncSession() as s:
+            return await s.get(http_server.base_url + "/hello")
+
+    response = run(main())
+    assert isinstance(response, requests.Response)
+    assert response.status_code == 200
+    assert response.text == "Hello\nWorld\n"
+
+
+def test_async_gather(http_server):
+    async def main():
+        async with AsyncSession() as s:
+            return await asyncio.gather(
+                *(s.get(http_server.base_url + "/json") for _ in range(10))
+            )
+
+    responses = run(main())
+    assert len(responses) == 10
+    assert all(r.json() == {"Hello": "World"} for r in responses)
+
+
+def test_async_post(http_server):
+    async def main():
+        async with AsyncSession() as s:
+            return await s.post(http_server.base_url + "/echo", data=b"Hello")
+
+    response = run(main())
+    assert response.status_code == 200
+    assert response.content == b"Hello"
+
+
+def test_async_connecterror():
+    async def main():
+        async with AsyncSession() as s:
+            await s.get("http://127.0.0.1:9")
+
+    with pytest.raises(requests.ConnectionError):
+        run(main())
+
+
+def test_async_retry(http_server):
+    from pycurl_requests.adapters import HTTPAdapter
+
+    async def main():
+        async with AsyncSession() as s:
+            s.mount("http://", HTTPAdapter(max_retries=2))
+            return await s.get(
+                http_server.base_url + "/flaky?id=async&n=2&retry_after=0"
+            )
+
+    response = run(main())
+    assert response.status_code == 200
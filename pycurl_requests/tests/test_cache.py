@@ -0,0 +1,219 @@
+"""
+Tests for response caching.
+"""
+
+import time
+import uuid
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.adapters.cache import (
+        CacheEntry,
+        CachingAdapter,
+        FileCache,
+        MemoryCache,
+        get_freshness_lifetime,
+        parse_cache_control,
+    )
+
+
+def cached_url(http_server, **params):
+    params.setdefault("id", uuid.uuid4().hex)
+    query = "&".join("{}={}".format(k, v) for k, v in params.items())
+    return http_server.base_url + "/cached?" + query
+
+
+def make_entry(headers=(), body=b"", response_time=None):
+    response_time = time.time() if response_time is None else response_time
+    return CacheEntry(
+        url="http://example.com",
+        status_code=200,
+        reason="OK",
+        http_version="HTTP/1.1",
+        headers=tuple(headers),
+        body=body,
+        request_time=response_time,
+        response_time=response_time,
+    )
+
+
+def test_cache_fresh(http_server):
+    url = cached_url(http_server)
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        first = s.get(url)
+        second = s.get(url)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert first.text == second.text == "Hello 1\n"
+    assert second.headers["Cache-Control"] == "max-age=60"
+    assert "Age" in second.headers
+
+
+def test_cache_no_store(http_server):
+    url = cached_url(http_server, cache_control="no-store")
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url).text == "Hello 1\n"
+        assert s.get(url).text == "Hello 2\n"
+
+
+def test_cache_request_no_cache(http_server):
+    url = cached_url(http_server)
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url).text == "Hello 1\n"
+        response = s.get(url, headers={"Cache-Control": "no-cache"})
+
+    assert response.text == "Hello 2\n"
+    assert not response.from_cache
+
+
+def test_cache_revalidate(http_server):
+    key = uuid.uuid4().hex
+    url = cached_url(http_server, id=key, cache_control="no-cache", etag='"v1"')
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url).text == "Hello 1\n"
+        response = s.get(url)
+
+    # Revalidated with a 304
+    assert response.from_cache
+    assert response.status_code == 200
+    assert response.text == "Hello 1\n"
+    assert http_server.attempts[key] == 2
+
+
+def test_cache_invalidate(http_server):
+    url = cached_url(http_server)
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url).text == "Hello 1\n"
+        assert s.post(url, data=b"").text == "Hello 2\n"
+        assert s.get(url).text == "Hello 3\n"
+
+
+@pytest.mark.parametrize(
+    "auth",
+    [
+        {"headers": {"Authorization": "Bearer secret"}},
+        {"auth": ("user", "secret")},
+    ],
+)
+def test_cache_authorized(http_server, auth):
+    url = cached_url(http_server)
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url, **auth).text == "Hello 1\n"
+        assert s.get(url, **auth).text == "Hello 2\n"
+
+        # Mustn't be returned to other users
+        response = s.get(url)
+        assert response.text == "Hello 3\n"
+        assert not response.from_cache
+
+
+def test_cache_authorized_public(http_server):
+    url = cached_url(http_server, cache_control="public,max-age=60")
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        assert s.get(url, auth=("user", "secret")).text == "Hello 1\n"
+        response = s.get(url)
+
+    assert response.from_cache
+    assert response.text == "Hello 1\n"
+
+
+def test_cache_redirect(http_server):
+    from urllib.parse import quote
+
+    target = cached_url(http_server)
+    url = http_server.base_url + "/found?location=" + quote(target, safe="")
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter())
+        first = s.get(url)
+        assert first.text == "Hello 1\n"
+        assert first.url == target
+
+        # The redirect is followed again (the target isn't cached for `url`)
+        response = s.get(url)
+        assert not response.from_cache
+        assert response.text == "Hello 2\n"
+
+        # Cached for the target's own URL
+        response = s.get(target)
+        assert response.from_cache
+
+
+def test_file_cache(http_server, tmp_path):
+    url = cached_url(http_server)
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter(cache=FileCache(str(tmp_path))))
+        assert s.get(url).text == "Hello 1\n"
+
+    with requests.Session() as s:
+        s.mount("http://", CachingAdapter(cache=FileCache(str(tmp_path))))
+        response = s.get(url)
+
+    assert response.from_cache
+    assert response.text == "Hello 1\n"
+
+
+def test_memory_cache_eviction():
+    cache = MemoryCache(max_size=100)
+    cache.set("a", make_entry(body=bytes(40)))
+    cache.set("b", make_entry(body=bytes(40)))
+    cache.get("a")
+    cache.set("c", make_entry(body=bytes(40)))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size == 80
+
+    # Too large to cache
+    cache.set("d", make_entry(body=bytes(101)))
+    assert cache.get("d") is None
+    assert len(cache) == 2
+
+
+def test_freshness_lifetime():
+    now = time.time()
+    date = "Thu, 01 Jan 2015 00:00:00 GMT"
+
+    assert get_freshness_lifetime(make_entry([("Cache-Control", "max-age=10")])) == 10
+    assert (
+        get_freshness_lifetime(
+            make_entry(
+                [("Date", date), ("Expires", "Thu, 01 Jan 2015 00:01:00 GMT")], b"", now
+            )
+        )
+        == 60
+    )
+    assert get_freshness_lifetime(make_entry([("Expires", "0")])) == 0
+    assert (
+        get_freshness_lifetime(
+            make_entry(
+                [("Date", date), ("Last-Modified", "Wed, 31 Dec 2014 23:00:00 GMT")]
+            )
+        )
+        == 360
+    )
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('no-cache, Max-Age=60, private="x"') == {
+        "no-cache": None,
+        "max-age": "60",
+        "private": "x",
+    }
+    assert parse_cache_control(None) == {}
@@ -0,0 +1,158 @@
+"""
+Tests for event hooks.
+"""
+
+import uuid
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.adapters import HTTPAdapter
+
+
+def test_response_hook(http_server):
+    seen = []
+
+    def hook(r, **kwargs):
+        seen.append(r.status_code)
+        r.hooked = True
+
+    response = requests.get(http_server.base_url + "/hello", hooks={"response": hook})
+
+    assert seen == [200]
+    assert response.hooked
+
+
+def test_response_hook_replaces_response(http_server):
+    replacement = requests.Response()
+
+    response = requests.get(
+        http_server.base_url + "/hello",
+        hooks={"response": [lambda r, **kw: replacement]},
+    )
+
+    assert response is replacement
+
+
+def test_session_response_hook(http_server):
+    seen = []
+
+    with requests.Session() as s:
+        s.hooks["response"].append(lambda r, **kwargs: seen.append(r.url))
+        s.get(http_server.base_url + "/hello")
+        s.get(http_server.base_url + "/json")
+
+    assert seen == [http_server.base_url + "/hello", http_server.base_url + "/json"]
+
+
+def test_register_hook():
+    def hook(r, **kwargs):
+        pass
+
+    request = requests.Request("GET", "http://example.com")
+    request.register_hook("response", hook)
+    assert request.hooks["response"] == [hook]
+    assert request.prepare().hooks["response"] == [hook]
+
+    assert request.deregister_hook("response", hook)
+    assert not request.deregister_hook("response", hook)
+
+    with pytest.raises(ValueError):
+        request.register_hook("unknown", hook)
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_and_request_hooks(http_server):
+    seen = []
+
+    with requests.Session() as s:
+        s.hooks["response"].append(lambda r, **kwargs: seen.append("session"))
+        s.get(
+            http_server.base_url + "/hello",
+            hooks={"response": lambda r, **kwargs: seen.append("request")},
+        )
+
+    assert seen == ["session", "request"]
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_pre_send_hook(http_server):
+    def hook(request, **kwargs):
+        request.headers["X-Foo"] = "Foo"
+
+    with requests.Session() as s:
+        s.hooks["pre_send"].append(hook)
+        response = s.get(http_server.base_url + "/headers")
+
+    assert "X-Foo: Foo" in response.text
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_post_perform_hook(http_server):
+    calls = []
+
+    def hook(request, response=None, error=None, timings=None, **kwargs):
+        calls.append((response.status_code, error, timings.size_download))
+
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=3))
+        s.hooks["post_perform"].append(hook)
+        s.get(http_server.base_url + "/flaky?n=1&retry_after=0&id=" + uuid.uuid4().hex)
+
+    # Called for each attempt
+    assert calls == [(503, None, 12), (200, None, 12)]
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_post_perform_hook_error():
+    calls = []
+
+    def hook(request, response=None, error=None, timings=None, **kwargs):
+        calls.append((response, error))
+
+    with requests.Session() as s:
+        s.hooks["post_perform"].append(hook)
+        with pytest.raises(requests.ConnectionError) as e:
+            s.get("http://localhost:0")
+
+    assert calls == [(None, e.value)]
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_post_perform_hook_stream(http_server):
+    calls = []
+
+    def hook(request, response=None, error=None, timings=None, **kwargs):
+        calls.append((error, timings.size_download))
+
+    url = http_server.base_url + "/slow_body?delay=0.2"
+    with requests.Session() as s:
+        s.hooks["post_perform"].append(hook)
+        with s.get(url, stream=True) as response:
+            # Called once the body has been read
+            assert calls == []
+            assert response.content == b"zZzZ\n"
+            assert calls == [(None, 5)]
+            assert response.timings.size_download == 5
+
+        # ...or the response is closed
+        with s.get(url, stream=True):
+            pass
+
+    assert len(calls) == 2
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_map_hooks(http_server):
+    seen = []
+
+    with requests.Session() as s:
+        s.hooks["pre_send"].append(lambda r, **kwargs: seen.append("pre_send"))
+        s.hooks["response"].append(lambda r, **kwargs: seen.append("response"))
+        reqs = [requests.Request("GET", http_server.base_url + "/hello")] * 2
+        list(s.map(reqs))
+
+    assert sorted(seen) == ["pre_send", "pre_send", "response", "response"]
@@ -0,0 +1,39 @@
+"""
+Tests for import-time behaviour.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from pycurl_requests.tests.utils import *
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+#: Modules that are only imported when used
+LAZY_MODULES = [
+    "asyncio",
+    "chardet",
+    "email.utils",
+    "http.cookiejar",
+    "tempfile",
+    "urllib3",
+    "pycurl_requests.adapters.cache",
+]
+
+
+def test_lazy_imports():
+    code = "import sys, pycurl_requests; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+
+    imported = set(output.split())
+    assert "pycurl_requests.sessions" in imported
+    assert imported.isdisjoint(LAZY_MODULES)
@@ -0,0 +1,94 @@
+"""
+Tests for JSON codecs.
+"""
+
+import datetime
+import json
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests import jsoncodec
+
+CODECS = ["json", "orjson", "msgspec", "ujson"]
+
+
+def get_codec(name):
+    try:
+        return jsoncodec.get_codec(name)
+    except ImportError:
+        pytest.skip("{} not installed".format(name))
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_codec(name):
+    codec = get_codec(name)
+    value = {"a": [1, 2.5, None, True], "b": "é", "c": 2**70}
+
+    encoded = codec.dumps(value)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == value
+
+    data = json.dumps(value).encode("ascii")
+    assert codec.loads(data) == value
+    if codec.accepts_buffer:
+        assert codec.loads(memoryview(data)) == value
+
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{")
+
+
+def test_auto_codec():
+    codec = jsoncodec.get_codec("auto")
+    value = {"nan": float("nan"), "inf": float("inf")}
+
+    # Encoded as by the standard library (faster codecs encode NaN as `null`)
+    assert codec.dumps(value) == json.dumps(value).encode("ascii")
+    assert codec.loads(b'{"Hello": "World"}') == {"Hello": "World"}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+def test_codec_unsupported_type(name):
+    codec = get_codec(name)
+
+    with pytest.raises(TypeError):
+        codec.dumps({"date": datetime.date(2000, 1, 1)})
+
+
+def test_get_codec():
+    assert jsoncodec.get_codec("auto") is jsoncodec.get_codec(None)
+    assert jsoncodec.get_codec("json") is jsoncodec.get_codec("json")
+
+    with pytest.raises(ValueError):
+        jsoncodec.get_codec("yaml")
+
+
+def test_set_default_codec():
+    stdlib = jsoncodec.get_codec("json")
+    try:
+        jsoncodec.set_default_codec("json")
+        assert jsoncodec.get_codec() is stdlib
+    finally:
+        jsoncodec.set_default_codec(None)
+
+    assert jsoncodec.get_codec() is jsoncodec.get_codec("auto")
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_session_json_codec(http_server, name):
+    codec = get_codec(name)
+
+    with requests.Session() as s:
+        s.json_codec = codec
+        response = s.post(http_server.base_url + "/echo", json={"Hello": "World"})
+        assert response.request.json_codec is codec
+        assert json.loads(response.content) == {"Hello": "World"}
+
+        assert s.get(http_server.base_url + "/json").json() == {"Hello": "World"}
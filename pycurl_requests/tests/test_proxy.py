@@ -0,0 +1,205 @@
+"""
+Tests for proxies.
+"""
+
+import os
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.adapters.proxy import (
+        get_environ_proxies,
+        select_proxy,
+        should_bypass_proxy,
+    )
+
+pycurl_requests_only = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+#: Nothing listens on port 1, so connections are refused
+UNREACHABLE_PROXY = "http://127.0.0.1:1"
+
+
+@pytest.fixture
+def environ(monkeypatch):
+    """Clear proxies from the environment."""
+    for name in list(os.environ):
+        if name.lower().endswith("_proxy"):
+            monkeypatch.delenv(name)
+
+    return monkeypatch
+
+
+def test_proxy(http_server):
+    # The test server handles absolute URLs, so can act as its own proxy
+    r = requests.get(
+        "http://example.invalid/hello", proxies={"http": http_server.base_url}
+    )
+    assert r.status_code == 200
+    assert r.text == "Hello\nWorld\n"
+    assert http_server.last_url.netloc == "example.invalid"
+
+
+def test_proxy_session(http_server):
+    with requests.Session() as s:
+        s.proxies = {"http": UNREACHABLE_PROXY}
+        with pytest.raises(requests.exceptions.ProxyError):
+            s.get(http_server.base_url + "/hello")
+
+        # Request proxies take precedence
+        r = s.get(
+            "http://example.invalid/hello", proxies={"http": http_server.base_url}
+        )
+        assert r.text == "Hello\nWorld\n"
+
+
+def test_proxy_socks(http_server):
+    with pytest.raises(requests.exceptions.ProxyError):
+        requests.get(
+            http_server.base_url + "/hello",
+            proxies={"http": "socks5h://127.0.0.1:1"},
+        )
+
+
+def test_proxy_environ(http_server, environ):
+    environ.setenv("HTTP_PROXY", UNREACHABLE_PROXY)
+    with requests.Session() as s:
+        with pytest.raises(requests.exceptions.ProxyError):
+            s.get(http_server.base_url + "/hello")
+
+    with requests.Session() as s:
+        s.trust_env = False
+        r = s.get(http_server.base_url + "/hello")
+        assert r.text == "Hello\nWorld\n"
+
+    environ.setenv("NO_PROXY", "example.com, 127.0.0.1")
+    with requests.Session() as s:
+        r = s.get(http_server.base_url + "/hello")
+        assert r.text == "Hello\nWorld\n"
+
+
+@pycurl_requests_only
+def test_proxy_environ_cached(http_server, environ):
+    with requests.Session() as s:
+        r = s.get(http_server.base_url + "/hello")
+        assert r.text == "Hello\nWorld\n"
+
+        # Environment is only read by the first request
+        environ.setenv("HTTP_PROXY", UNREACHABLE_PROXY)
+        r = s.get(http_server.base_url + "/hello")
+        assert r.text == "Hello\nWorld\n"
+
+    with requests.Session() as s:
+        with pytest.raises(requests.exceptions.ProxyError):
+            s.get(http_server.base_url + "/hello")
+
+
+@pycurl_requests_only
+def test_get_environ_proxies():
+    environ = {
+        "HTTP_PROXY": "http://upper:3128",
+        "http_proxy": "http://lower:3128",
+        "HTTPS_PROXY": "http://secure:3128",
+        "ALL_PROXY": "socks5h://socks:1080",
+        "FTP_PROXY": "",
+        "NO_PROXY": "localhost",
+        "PATH": "/usr/bin",
+    }
+    assert get_environ_proxies(environ) == {
+        "http": "http://lower:3128",
+        "https": "http://secure:3128",
+        "all": "socks5h://socks:1080",
+        "no_proxy": "localhost",
+    }
+
+    # Ignore `HTTP_PROXY` in CGI scripts
+    environ = {"HTTP_PROXY": "http://upper:3128", "REQUEST_METHOD": "GET"}
+    assert get_environ_proxies(environ) == {}
+
+
+@pycurl_requests_only
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("http://example.com/", "http://host:3128"),
+        ("http://other.com/", "http://http:3128"),
+        ("HTTP://other.com/", "http://http:3128"),
+        ("https://example.com/", "http://all-host:3128"),
+        ("https://other.com/", "socks5h://all:1080"),
+        ("http://localhost:8080/", None),
+        ("http://direct.com/", None),
+    ],
+)
+def test_select_proxy(url, expected):
+    proxies = {
+        "http://example.com": "http://host:3128",
+        "http://direct.com": None,
+        "http": "http://http:3128",
+        "all://example.com": "http://all-host:3128",
+        "all": "socks5h://all:1080",
+        "no_proxy": "localhost",
+    }
+    assert select_proxy(url, proxies) == expected
+
+
+@pycurl_requests_only
+def test_select_proxy_empty():
+    assert select_proxy("http://example.com/", None) is None
+    assert select_proxy("http://example.com/", {}) is None
+    assert select_proxy("http://example.com/", {"https": "http://proxy"}) is None
+
+
+@pycurl_requests_only
+@pytest.mark.parametrize(
+    "host,port,no_proxy,expected",
+    [
+        ("example.com", 80, "example.com", True),
+        ("www.example.com", 80, "example.com", True),
+        ("www.example.com", 80, ".example.com", True),
+        ("www.example.com", 80, "*.example.com", True),
+        ("notexample.com", 80, "example.com", False),
+        ("EXAMPLE.com", 80, " other.com , Example.COM ", True),
+        ("example.com", 8080, "example.com:8080", True),
+        ("example.com", 80, "example.com:8080", False),
+        ("anything", 80, "*", True),
+        ("10.1.2.3", 80, "10.0.0.0/8", True),
+        ("192.168.0.1", 80, "10.0.0.0/8", False),
+        ("127.0.0.1", 80, "127.0.0.1", True),
+        ("::1", 80, "::1", True),
+        ("example.com", 80, "10.0.0.0/8", False),
+        ("example.com", 80, "", False),
+    ],
+)
+def test_should_bypass_proxy(host, port, no_proxy, expected):
+    assert should_bypass_proxy(host, port, no_proxy) is expected
+
+
+@pycurl_requests_only
+def test_proxy_map(http_server, environ):
+    urls = [http_server.base_url + "/hello"] * 3
+
+    with requests.Session() as s:
+        s.proxies = {"http": UNREACHABLE_PROXY}
+        with pytest.raises(requests.exceptions.ProxyError):
+            list(s.map(requests.Request("GET", url) for url in urls))
+
+        # Request proxies take precedence
+        responses = s.map(
+            (requests.Request("GET", url) for url in urls), proxies={"http": None}
+        )
+        assert [r.text for r in responses] == ["Hello\nWorld\n"] * 3
+
+    environ.setenv("HTTP_PROXY", UNREACHABLE_PROXY)
+    with requests.Session() as s:
+        with pytest.raises(requests.exceptions.ProxyError):
+            list(s.map(requests.Request("GET", url) for url in urls))
+
+    with requests.Session() as s:
+        # libcurl mustn't read the environment itself
+        s.trust_env = False
+        responses = s.map(requests.Request("GET", url) for url in urls)
+        assert [r.text for r in responses] == ["Hello\nWorld\n"] * 3
@@ -1,5 +1,9 @@
 import datetime
+import io
+import mmap
+import os
 import sys
+import time
 
 import pytest
 
@@ -138,6 +142,17 @@ def test_get_redirect_nofollow(http_server):
     assert response.text == "Redirecting...\n"
 
 
+def test_get_redirect_follow(http_server):
+    response = requests.get(http_server.base_url + "/moved")
+    response.raise_for_status()
+
+    assert response.url.endswith("/hello")
+    assert response.status_code == 200
+    assert response.reason == "OK"
+    assert "Location" not in response.headers
+    assert response.text == "Hello\nWorld\n"
+
+
 def test_get_redirect(http_server):
     with pytest.raises(requests.TooManyRedirects) as e:
         requests.get(http_server.base_url + "/redirect")
@@ -153,6 +168,131 @@ def test_get_json(http_server):
     assert response.json() == {"Hello": "World"}
 
 
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_get_headers_lazy(http_server):
+    response = requests.get(http_server.base_url + "/hello")
+    assert response.status_code == 200
+    assert response._headers is None
+
+    assert response.headers["Content-Type"] == "text/html; charset=UTF-8"
+    assert response._header_lines is None
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_get_timings(http_server):
+    with requests.Session() as s:
+        response = s.get(http_server.base_url + "/moved")
+        timings = response.timings
+        assert timings.namelookup <= timings.connect <= timings.pretransfer
+        assert timings.pretransfer <= timings.starttransfer <= timings.total
+        assert timings.redirect_count == 1
+        assert timings.size_download == len(response.content)
+        assert timings.size_upload == 0
+        assert timings.num_connects >= 1
+        assert timings.primary_ip == "127.0.0.1"
+        assert http_server.base_url.endswith(":{}".format(timings.primary_port))
+
+        response = s.post(http_server.base_url + "/echo", data=b"Hello")
+        assert response.timings.size_upload == 5
+
+
+def test_get_content_cached(http_server):
+    response = requests.get(http_server.base_url + "/hello")
+    response.raise_for_status()
+
+    assert response.content is response.content
+    if IS_PYCURL_REQUESTS:
+        # Requests decodes the text every time
+        assert response.text is response.text
+
+    # Text is decoded again if the encoding changes
+    response.encoding = "utf-16"
+    assert response.text == response.content.decode("utf-16")
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+@pytest.mark.parametrize(
+    "data, encoding",
+    [
+        (b"Hello", "ascii"),
+        ("Héllo".encode("utf-8"), "utf-8"),
+        ("Héllo".encode("utf-8-sig"), "utf-8-sig"),
+        ("Héllo".encode("utf-16"), "utf-16"),
+        # Only the sample is ASCII
+        (b"a" * 10 + "é".encode("utf-8"), "utf-8"),
+        # Sample ends part way through a character
+        (b"a" * 9 + "é".encode("utf-8"), "utf-8"),
+    ],
+)
+def test_detect_encoding(data, encoding):
+    from pycurl_requests.models import detect_encoding
+
+    assert detect_encoding(data, sample_size=10) == encoding
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_apparent_encoding_fallback():
+    import io
+
+    text = "Le cœur a ses raisons que la raison ne connaît point. " * 10
+    response = requests.Response()
+    response.raw = io.BytesIO(text.encode("cp1252"))
+    response.headers = CaseInsensitiveDict()
+
+    assert response.encoding is None
+    assert response.apparent_encoding is response.apparent_encoding
+    assert response.apparent_encoding not in ("ascii", "utf-8")
+    assert response.text == text
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_get_json_cached(http_server):
+    response = requests.get(http_server.base_url + "/json")
+    response.raise_for_status()
+
+    assert response.json() is response.json()
+    assert response.json(parse_int=str) is not response.json()
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+@pytest.mark.parametrize("spool_size", [1000, 1000000])
+def test_get_content_view(http_server, spool_size):
+    from pycurl_requests.adapters import PyCurlHttpAdapter
+
+    with requests.Session() as s:
+        s.mount("http://", PyCurlHttpAdapter(spool_size=spool_size))
+        response = s.get(http_server.base_url + "/bytes?n=100000")
+        response.raise_for_status()
+
+    view = response.content_view
+    assert view.readonly
+    assert view.nbytes == 100000
+    assert view == response.content
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_get_content_view_sink(http_server):
+    with requests.Session() as s:
+        response = s.download(http_server.base_url + "/hello", io.BytesIO())
+
+    view = response.content_view
+    assert view.readonly
+    assert view == b"Hello\nWorld\n"
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_get_content_sink_offset(http_server):
+    sink = io.BytesIO(b"Header\n")
+    sink.seek(0, io.SEEK_END)
+    with requests.Session() as s:
+        response = s.download(http_server.base_url + "/hello", sink)
+
+    # Only the body, not what was already in the sink
+    assert response.content_view == b"Hello\nWorld\n"
+    assert response.content == b"Hello\nWorld\n"
+    assert sink.getvalue() == b"Header\nHello\nWorld\n"
+
+
 def test_get_iter_content(http_server):
     response = requests.get(http_server.base_url + "/hello")
     response.raise_for_status()
@@ -181,6 +321,131 @@ def test_get_iter_lines(delimiter, http_server):
         assert next(it)
 
 
+def test_get_stream(http_server):
+    n = 4 * 1024 * 1024
+    with requests.get(
+        http_server.base_url + "/bytes", params={"n": n}, stream=True
+    ) as response:
+        response.raise_for_status()
+        assert response.headers["Content-Length"] == str(n)
+
+        total = 0
+        for chunk in response.iter_content(64 * 1024):
+            assert len(chunk) <= 64 * 1024
+            total += len(chunk)
+
+    assert total == n
+
+
+def test_get_stream_content(http_server):
+    response = requests.get(http_server.base_url + "/hello", stream=True)
+    assert response.content == b"Hello\nWorld\n"
+    assert response.text == "Hello\nWorld\n"
+    assert list(response.iter_lines(decode_unicode=True)) == ["Hello", "World"]
+
+
+def test_get_stream_headers(http_server):
+    # Returns as soon as the headers are received, without waiting for the body
+    start = time.perf_counter()
+    with requests.get(
+        http_server.base_url + "/slow_body?delay=1", stream=True
+    ) as response:
+        assert time.perf_counter() - start < 0.5
+        assert response.status_code == 200
+        assert response.content == b"zZzZ\n"
+
+    assert time.perf_counter() - start >= 1
+
+
+def test_get_stream_redirect(http_server):
+    response = requests.get(http_server.base_url + "/moved", stream=True)
+    assert response.status_code == 200
+    assert response.content == b"Hello\nWorld\n"
+
+
+def test_get_stream_connecterror():
+    with pytest.raises(requests.ConnectionError):
+        requests.get("http://127.0.0.1:9", stream=True)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"Hello",
+        "Hello",
+        bytearray(b"Hello"),
+        memoryview(b"Hello"),
+        bytearray(range(256)) * 1024,
+        memoryview(bytes(range(256)) * 1024),
+    ],
+)
+def test_post_data(http_server, data):
+    response = requests.post(http_server.base_url + "/echo", data=data)
+    response.raise_for_status()
+
+    expected = data.encode("iso-8859-1") if isinstance(data, str) else bytes(data)
+    assert response.content == expected
+
+
+def test_post_mmap(http_server, tmp_path):
+    path = tmp_path / "body"
+    path.write_bytes(bytes(range(256)) * 1024)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            response = requests.post(http_server.base_url + "/echo", data=data)
+            response.raise_for_status()
+
+    assert response.content == path.read_bytes()
+
+
+def test_post_no_content_type(http_server):
+    response = requests.post(http_server.base_url + "/headers", data=b"Hello")
+    response.raise_for_status()
+
+    assert "Content-Type" not in response.text
+    assert "Content-Length: 5" in response.text
+
+
+def test_post_generator(http_server):
+    def generate():
+        yield b"Hello"
+        yield b""
+        yield "World"
+        yield bytearray(b"!" * 100000)
+
+    response = requests.post(http_server.base_url + "/echo", data=generate())
+    response.raise_for_status()
+
+    assert response.content == b"HelloWorld" + b"!" * 100000
+
+
+def test_post_generator_headers(http_server):
+    response = requests.post(http_server.base_url + "/headers", data=iter([b"Hi"]))
+    response.raise_for_status()
+
+    assert "Transfer-Encoding: chunked" in response.text
+    assert "Content-Length" not in response.text
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_post_generator_error(http_server):
+    def generate():
+        yield b"Hello"
+        raise ValueError("Oops")
+
+    with pytest.raises(ValueError, match="Oops"):
+        requests.post(http_server.base_url + "/echo", data=generate())
+
+
+def test_put_then_get(http_server):
+    with requests.Session() as s:
+        s.put(http_server.base_url + "/echo", data=b"Hello").raise_for_status()
+        response = s.get(http_server.base_url + "/headers")
+        response.raise_for_status()
+
+    assert "Content-Length" not in response.text
+
+
 TEST_COOKIEJAR = cookies.RequestsCookieJar()
 TEST_COOKIEJAR.update({"a": "Fizz", "b": "Bazz"})
 
@@ -196,6 +461,53 @@ def test_cookies(http_server, cookies_):
     )
 
 
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_default_session(http_server):
+    from pycurl_requests import api
+
+    api.use_default_session()
+    try:
+        response = requests.get(http_server.base_url + "/hello")
+        assert response.text == "Hello\nWorld\n"
+
+        session = api._default_session
+        assert session is not None
+
+        response = requests.get(http_server.base_url + "/json")
+        assert response.json() == {"Hello": "World"}
+        assert api._default_session is session
+    finally:
+        api.use_default_session(False)
+
+    assert api._default_session is None
+    assert session.curl is None
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+def test_default_session_fork(http_server):
+    from pycurl_requests import api
+
+    api.use_default_session()
+    try:
+        requests.get(http_server.base_url + "/hello")
+        session = api._default_session
+
+        pid = os.fork()
+        if pid == 0:
+            # The parent's session is kept (so its connections aren't closed)
+            ok = api._default_session is None and session in api._inherited_sessions
+            ok = ok and requests.get(http_server.base_url + "/hello").ok
+            ok = ok and api._default_session is not session
+            os._exit(0 if ok else 1)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert api._default_session is session
+    finally:
+        api.use_default_session(False)
+
+
 # Timeouts should go last, because '/slow' hangs the HTTP server
 @pytest.mark.parametrize("timeout", [0.1, (None, 0.1)])
 def test_get_timeout(http_server, timeout):
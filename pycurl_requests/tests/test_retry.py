@@ -0,0 +1,141 @@
+"""
+Tests for retrying requests.
+"""
+
+import io
+import uuid
+
+import pytest
+
+from pycurl_requests import requests
+from pycurl_requests.tests.utils import *  # Used for fixtures
+
+pytestmark = pytest.mark.skipif(
+    not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific"
+)
+
+if IS_PYCURL_REQUESTS:
+    import pycurl
+
+    from pycurl_requests import exceptions
+    from pycurl_requests.adapters import HTTPAdapter, Retry
+    from pycurl_requests.adapters.retry import parse_retry_after
+
+
+def flaky_url(http_server, **params):
+    params.setdefault("id", uuid.uuid4().hex)
+    query = "&".join("{}={}".format(k, v) for k, v in params.items())
+    return http_server.base_url + "/flaky?" + query
+
+
+def test_retry_after(http_server):
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=3))
+        response = s.get(flaky_url(http_server, n=2, retry_after=0))
+
+    assert response.status_code == 200
+    assert response.text == "Hello\nWorld\n"
+
+
+def test_retry_status_forcelist(http_server):
+    retry = Retry(3, status_forcelist={500})
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=retry))
+        assert s.get(flaky_url(http_server, n=3, status=500)).status_code == 200
+
+        with pytest.raises(requests.exceptions.RetryError) as e:
+            s.get(flaky_url(http_server, n=4, status=500))
+
+        assert e.value.response.status_code == 500
+
+
+def test_retry_no_raise_on_status(http_server):
+    retry = Retry(1, status_forcelist={500}, raise_on_status=False)
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=retry))
+        response = s.get(flaky_url(http_server, n=2, status=500))
+
+    assert response.status_code == 500
+
+
+def test_retry_not_allowed_method(http_server):
+    retry = Retry(3, status_forcelist={500})
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=retry))
+        response = s.post(flaky_url(http_server, n=1, status=500), data=b"Hello")
+
+    assert response.status_code == 500
+
+
+def test_retry_body(http_server):
+    retry = Retry(3, status_forcelist={500}, allowed_methods=None)
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=retry))
+        url = flaky_url(http_server, n=1, status=500)
+        assert s.post(url, data=io.BytesIO(b"Hello")).status_code == 200
+
+        # Generators can't be rewound
+        url = flaky_url(http_server, n=1, status=500)
+        assert s.post(url, data=iter([b"Hello"])).status_code == 500
+
+
+def test_retry_sink(http_server):
+    sink = io.BytesIO()
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=Retry(1, status_forcelist={500})))
+        s.download(flaky_url(http_server, n=1, status=500), sink)
+
+    assert sink.getvalue() == b"Hello\nWorld\n"
+
+
+def test_retry_connect_error():
+    with requests.Session() as s:
+        s.mount("http://", HTTPAdapter(max_retries=2))
+        with pytest.raises(requests.ConnectionError):
+            s.get("http://127.0.0.1:9")
+
+
+def test_retry_increment():
+    error = exceptions.ConnectionError(curl_code=pycurl.E_COULDNT_CONNECT)
+    retry = Retry(2).increment("POST", error=error)
+    assert retry.total == 1
+    assert len(retry.history) == 1
+
+    retry = retry.increment("POST", error=error)
+    with pytest.raises(exceptions.ConnectionError):
+        retry.increment("POST", error=error)
+
+    # Request may have been sent, so only retry idempotent methods
+    error = exceptions.Timeout(curl_code=pycurl.E_OPERATION_TIMEDOUT)
+    assert Retry(2).increment("GET", error=error).total == 1
+    with pytest.raises(exceptions.Timeout):
+        Retry(2).increment("POST", error=error)
+
+    # Not a transient error
+    error = exceptions.InvalidURL(curl_code=pycurl.E_URL_MALFORMAT)
+    with pytest.raises(exceptions.InvalidURL):
+        Retry(2).increment("GET", error=error)
+
+
+def test_retry_backoff():
+    retry = Retry(5, backoff_factor=0.5, backoff_max=1.5)
+    error = exceptions.ConnectionError(curl_code=pycurl.E_COULDNT_CONNECT)
+    backoffs = []
+    for _ in range(4):
+        retry = retry.increment("GET", error=error)
+        backoffs.append(retry.get_backoff_time())
+
+    assert backoffs == [0, 1.0, 1.5, 1.5]
+
+    retry = Retry(5, backoff_factor=0.5, backoff_jitter=0.1).increment(
+        "GET", error=error
+    )
+    retry = retry.increment("GET", error=error)
+    assert 1.0 <= retry.get_backoff_time() <= 1.1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("Fri, 31 Dec 9999 23:59:59 GMT") > 0
+    assert parse_retry_after("soon") is None
@@ -6,6 +6,10 @@ the tests for the tests for `api` (which itself is just a thin wrapper around a
 single-use Session).
 """
 
+import concurrent.futures
+import os
+import time
+
 import pycurl
 import pytest
 
@@ -52,6 +56,20 @@ def test_session_parameters(http_server):
     assert response.text == "a: 1\nb: 3\nc: 4"
 
 
+def test_session_headers_none():
+    with requests.Session() as s:
+        s.headers.update({"X-Foo": "Foo", "X-Bar": "Bar"})
+        prepared = s.prepare_request(
+            requests.Request(
+                "GET", "http://example.com", headers={"X-Foo": None, "X-Baz": "Baz"}
+            )
+        )
+
+    assert "X-Foo" not in prepared.headers
+    assert prepared.headers["X-Bar"] == "Bar"
+    assert prepared.headers["X-Baz"] == "Baz"
+
+
 COOKIEJAR2 = cookies.RequestsCookieJar()
 COOKIEJAR2.update({"b": "Buzz", "c": "Boo"})
 
@@ -63,3 +81,232 @@ def test_session_cookies(http_server, cookies_):
         response = s.get(http_server.base_url + "/cookies", cookies=cookies_)
 
     assert response.text == "a: Fizz\nb: Buzz\nc: Boo"
+
+
+def test_session_threads(http_server):
+    with requests.Session() as s:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(
+                executor.map(lambda _: s.get(http_server.base_url + "/hello"), range(8))
+            )
+
+    assert all(r.text == "Hello\nWorld\n" for r in responses)
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_pool_reuses_handle(http_server):
+    with requests.Session() as s:
+        adapter = s.get_adapter(http_server.base_url)
+        s.get(http_server.base_url + "/hello")
+
+        # Most recently used handle should be handed out first
+        curl = adapter.pool.get()
+        try:
+            assert curl is s.curl
+        finally:
+            adapter.pool.put(curl)
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_send_many(http_server):
+    paths = ["/hello", "/json", "/not_found"] * 5
+    with requests.Session() as s:
+        prepared = [
+            s.prepare_request(requests.Request("GET", http_server.base_url + p))
+            for p in paths
+        ]
+        responses = list(s.send_many(prepared, concurrency=4))
+
+    assert sorted(r.request.path_url for r in responses) == sorted(paths)
+    for r in responses:
+        if r.request.path_url == "/hello":
+            assert r.text == "Hello\nWorld\n"
+        elif r.request.path_url == "/json":
+            assert r.json() == {"Hello": "World"}
+        else:
+            assert r.status_code == 404
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_map_return_exceptions(http_server):
+    urls = [http_server.base_url + "/hello", "http://127.0.0.1:9/"]
+    with requests.Session() as s:
+        results = list(
+            s.map(
+                (requests.Request("GET", u) for u in urls),
+                concurrency=2,
+                return_exceptions=True,
+            )
+        )
+
+    assert len(results) == 2
+    errors = [r for r in results if isinstance(r, requests.RequestException)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], requests.ConnectionError)
+    assert errors[0].request.url == "http://127.0.0.1:9/"
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_map_raises():
+    with requests.Session() as s:
+        with pytest.raises(requests.ConnectionError):
+            list(s.map([requests.Request("GET", "http://127.0.0.1:9/")]))
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_stream_releases_handle(http_server):
+    with requests.Session() as s:
+        adapter = s.get_adapter(http_server.base_url)
+        with s.get(http_server.base_url + "/slow_body?delay=0.2", stream=True) as r:
+            # Handle is in use until the transfer is over
+            curl = adapter.pool.get()
+            assert curl is not s.curl
+            adapter.pool.put(curl)
+
+            assert r.content == b"zZzZ\n"
+
+        curl = adapter.pool.get()
+        try:
+            assert curl is s.curl
+        finally:
+            adapter.pool.put(curl)
+
+        with s.get(http_server.base_url + "/bytes", stream=True) as r:
+            # Let the rest of the body arrive
+            time.sleep(0.1)
+            assert r.raw.read(1) == b"\x00"
+            assert r.raw.done
+
+            # Handle is released while the buffered body is still being read
+            curl = adapter.pool.get()
+            try:
+                assert curl is s.curl
+            finally:
+                adapter.pool.put(curl)
+
+            assert len(r.raw.read()) == 1023
+
+        with s.head(http_server.base_url + "/hello", stream=True) as r:
+            # Transfer was over as soon as the headers were received
+            assert r.raw.done
+            curl = adapter.pool.get()
+            try:
+                assert curl is s.curl
+            finally:
+                adapter.pool.put(curl)
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_stream_start_error(http_server, monkeypatch):
+    from pycurl_requests.adapters import stream
+
+    def driver():
+        raise RuntimeError("Failed")
+
+    monkeypatch.setattr(stream, "CurlMultiDriver", driver)
+    with requests.Session() as s:
+        adapter = s.get_adapter(http_server.base_url)
+        with pytest.raises(RuntimeError):
+            s.get(http_server.base_url + "/hello", stream=True)
+
+        curl = adapter.pool.get()
+        try:
+            assert curl is s.curl
+        finally:
+            adapter.pool.put(curl)
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_default_share(keepalive_server):
+    from pycurl_requests.adapters import share
+
+    url = keepalive_server.base_url + "/hello"
+    share.enable_default_share()
+    try:
+        assert share.get_default_share() is not None
+        with requests.Session() as s1, requests.Session() as s2:
+            r = s1.get(url)
+            assert r.text == "Hello\nWorld\n"
+            assert r.timings.num_connects == 1
+
+            # The connection is shared between the sessions' handles
+            r = s2.get(url)
+            assert r.text == "Hello\nWorld\n"
+            assert r.timings.num_connects == 0
+    finally:
+        share.disable_default_share()
+
+    assert share.get_default_share() is None
+
+    with requests.Session() as s1, requests.Session() as s2:
+        assert s1.get(url).timings.num_connects == 1
+        assert s2.get(url).timings.num_connects == 1
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork")
+def test_session_default_share_fork(keepalive_server):
+    from pycurl_requests.adapters import share
+
+    url = keepalive_server.base_url + "/hello"
+    share.enable_default_share()
+    try:
+        parent_share = share.get_default_share()
+        with requests.Session() as s:
+            assert s.get(url).ok
+
+        pid = os.fork()
+        if pid == 0:
+            # The parent's share is kept (so its connections aren't closed)
+            ok = share.get_default_share() is not parent_share
+            ok = ok and parent_share in share._inherited_shares
+            with requests.Session() as s:
+                ok = ok and s.get(url).timings.num_connects == 1
+            os._exit(0 if ok else 1)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert share.get_default_share() is parent_share
+
+        with requests.Session() as s:
+            assert s.get(url).timings.num_connects == 0
+    finally:
+        share.disable_default_share()
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_download_path(http_server, tmp_path):
+    path = tmp_path / "body"
+    with requests.Session() as s:
+        with s.download(http_server.base_url + "/bytes?n=100000", path) as response:
+            response.raise_for_status()
+            assert response.headers["Content-Type"] == "application/octet-stream"
+            assert response.raw.name == str(path)
+            assert len(response.content) == 100000
+
+        assert response.raw.closed
+
+    assert path.read_bytes() == response.content
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_download_fileobj(http_server, tmp_path):
+    path = tmp_path / "body"
+    with open(path, "w+b") as f:
+        f.write(b"Header\n")
+        with requests.Session() as s:
+            response = s.download(http_server.base_url + "/hello", f)
+            response.raise_for_status()
+
+        # Body is read from where it was written
+        assert response.raw is f
+        assert response.text == "Hello\nWorld\n"
+
+    assert path.read_bytes() == b"Header\nHello\nWorld\n"
+
+
+@pytest.mark.skipif(not IS_PYCURL_REQUESTS, reason="PycURL-Requests specific")
+def test_session_download_stream(http_server, tmp_path):
+    with requests.Session() as s:
+        with pytest.raises(ValueError):
+            s.download(http_server.base_url + "/hello", tmp_path / "body", stream=True)
@@ -0,0 +1,62 @@
+"""
+Tests for data structures.
+"""
+
+from pycurl_requests.tests.utils import *
+
+if IS_PYCURL_REQUESTS:
+    from pycurl_requests.structures import CaseInsensitiveDict
+else:
+    from requests.structures import CaseInsensitiveDict
+
+
+def test_caseinsensitivedict():
+    cid = CaseInsensitiveDict({"Accept": "*/*"}, user_agent="test")
+    cid["X-Foo"] = "Foo"
+    cid["x-foo"] = "Bar"
+
+    assert cid["ACCEPT"] == "*/*"
+    assert "x-FOO" in cid
+    assert "X-Bar" not in cid
+    assert len(cid) == 3
+    assert list(cid) == ["Accept", "user_agent", "x-foo"]
+    assert list(cid.lower_items()) == [
+        ("accept", "*/*"),
+        ("user_agent", "test"),
+        ("x-foo", "Bar"),
+    ]
+    assert cid == {"accept": "*/*", "USER_AGENT": "test", "X-Foo": "Bar"}
+
+    del cid["X-FOO"]
+    assert "x-foo" not in cid
+
+
+def test_caseinsensitivedict_copy():
+    original = CaseInsensitiveDict({"Accept": "*/*", "User-Agent": "test"})
+    copy = original.copy()
+    copy["accept"] = "text/html"
+    copy["X-Foo"] = "Foo"
+    del copy["User-Agent"]
+
+    assert dict(copy.items()) == {"accept": "text/html", "X-Foo": "Foo"}
+    assert list(copy.values()) == ["text/html", "Foo"]
+    assert "user-agent" not in copy
+    assert dict(original.items()) == {"Accept": "*/*", "User-Agent": "test"}
+
+    # Changes to the original aren't seen by copies
+    original["X-Bar"] = "Bar"
+    assert "X-Bar" not in copy
+    assert original.copy().copy() == original
+
+
+def test_caseinsensitivedict_update():
+    cid = CaseInsensitiveDict()
+    cid.update({"Accept": "*/*"}, self="self", other="other")
+    cid.update([("X-Foo", "Foo")])
+
+    assert dict(cid.items()) == {
+        "Accept": "*/*",
+        "self": "self",
+        "other": "other",
+        "X-Foo": "Foo",
+    }
@@ -3,6 +3,7 @@ Test helper utilities.
 """
 
 import json
+import socketserver
 import threading
 import time
 from http import cookies
@@ -13,7 +14,7 @@ import pytest
 
 from pycurl_requests import requests
 
-__all__ = ["IS_PYCURL_REQUESTS", "http_server"]
+__all__ = ["IS_PYCURL_REQUESTS", "http_server", "keepalive_server"]
 
 #: Is this _really_ PyCurl-Requests?
 #: Should be used when testing for PyCurl-Requests extensions.
@@ -33,6 +34,25 @@ def http_server():
         thread.join()
 
 
+@pytest.fixture(scope="module")
+def keepalive_server():
+    """HTTP/1.1 server that keeps connections alive (so reuse can be tested)."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHTTPRequestHandler)
+    httpd.base_url = "http://{}:{}".format(*httpd.server_address)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        thread.join()
+
+
+# `http.server.ThreadingHTTPServer` needs Python 3.7
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
 class HTTPRequestHandler(BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         # Mute HTTP logging
@@ -41,6 +61,7 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         # Remember last requested URL
         self.server.last_url = self.url
+        self.server.last_command = self.command
 
         if self.url.path.startswith("/redirect"):
             self.do_GET_redirect()
@@ -48,6 +69,23 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             path = self.url.path[1:].replace("/", "_")
             getattr(self, f"do_GET_{path}", self.do_HTTP_404)()
 
+    def do_POST(self):
+        # Remember last requested URL
+        self.server.last_url = self.url
+        self.server.last_command = self.command
+
+        path = self.url.path[1:].replace("/", "_")
+        getattr(self, f"do_POST_{path}", self.do_HTTP_404)()
+
+    do_PUT = do_POST
+
+    def do_POST_echo(self):
+        self.response(self.read_body(), content_type="application/octet-stream")
+
+    def do_POST_headers(self):
+        self.read_body()
+        self.do_GET_headers()
+
     def do_GET_hello(self):
         self.response("Hello\nWorld\n")
 
@@ -67,13 +105,93 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             "Redirecting...\n", (302, "Found"), headers={"Location": f"/redirect{n}"}
         )
 
+    def do_GET_found(self):
+        # Temporary redirect to the `location` query parameter
+        location = dict(parse_qsl(self.url.query))["location"]
+        self.response("Found\n", (302, "Found"), headers={"Location": location})
+
+    def do_GET_moved(self):
+        self.response(
+            "Moved\n", (301, "Moved Permanently"), headers={"Location": "/hello"}
+        )
+
+    def do_GET_flaky(self):
+        # Fails the first `n` requests for each `id`
+        query = dict(parse_qsl(self.url.query))
+        key = query.get("id")
+        attempts = self.server.attempts = getattr(self.server, "attempts", {})
+        attempts[key] = attempts.get(key, 0) + 1
+        if attempts[key] <= int(query.get("n", 1)):
+            headers = {}
+            if "retry_after" in query:
+                headers["Retry-After"] = query["retry_after"]
+
+            status = (int(query.get("status", 503)), "Error")
+            self.response("Unavailable\n", status, headers=headers)
+        else:
+            self.response("Hello\nWorld\n")
+
+    def do_POST_flaky(self):
+        self.read_body()
+        self.do_GET_flaky()
+
+    def do_GET_cached(self):
+        # Cacheable response, counting requests for each `id`
+        query = dict(parse_qsl(self.url.query))
+        key = query.get("id")
+        attempts = self.server.attempts = getattr(self.server, "attempts", {})
+        attempts[key] = attempts.get(key, 0) + 1
+
+        headers = {"Cache-Control": query.get("cache_control", "max-age=60")}
+        if "etag" in query:
+            headers["ETag"] = query["etag"]
+
+        if "etag" in query and self.headers.get("If-None-Match") == query["etag"]:
+            self.send_response(304)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        self.response("Hello {}\n".format(attempts[key]), headers=headers)
+
+    def do_POST_cached(self):
+        self.read_body()
+        self.do_GET_cached()
+
     def do_GET_json(self):
         self.response(json.dumps({"Hello": "World"}), content_type="application/json")
 
+    def do_GET_bytes(self):
+        query = dict(parse_qsl(self.url.query))
+        n = int(query.get("n", 1024))
+        chunk = bytes(range(256)) * 64
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        if "unknown_length" not in query:
+            self.send_header("Content-Length", n)
+        else:
+            # Body ends when the connection is closed
+            self.close_connection = True
+        self.end_headers()
+
+        while n > 0:
+            self.wfile.write(chunk[:n])
+            n -= len(chunk)
+
     def do_GET_slow(self):
         time.sleep(2)
         self.response("zZzZ\n")
 
+    def do_GET_slow_body(self):
+        # Headers are sent immediately, but the body is delayed
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", 5)
+        self.end_headers()
+        time.sleep(float(dict(parse_qsl(self.url.query)).get("delay", 1)))
+        self.wfile.write(b"zZzZ\n")
+
     def do_GET_cookies(self):
         if "Cookie" not in self.headers:
             self.send_error(400, "No `Cookie` header sent")
@@ -105,6 +223,24 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
     def do_HTTP_404(self):
         self.send_error(404, "Not Found")
 
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0], 16)
+                if size == 0:
+                    # Discard trailers
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+
+                body.extend(self.rfile.read(size))
+                self.rfile.readline()
+
+            return bytes(body)
+
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
     @property
     def url(self):
         if not hasattr(self, "_url"):
@@ -126,3 +262,7 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
         self.wfile.write(body)
+
+
+class KeepAliveHTTPRequestHandler(HTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
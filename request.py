@@ -61,11 +61,6 @@ def main():
         handlers=[handler], level=logging.DEBUG if args.verbose else logging.ERROR
     )
 
-    if args.output:
-        output = open(args.output, "wb")
-    else:
-        output = sys.stdout.buffer
-
     if args.request:
         method = args.request
     else:
@@ -104,15 +99,38 @@ def main():
     else:
         data = None
 
-    r = requests.request(
-        method,
-        args.url,
+    kwargs = dict(
+        method=method,
         headers=headers,
         data=data,
         json=args.json,
         allow_redirects=args.location,
     )
-    if output.isatty():
+
+    output = args.output or sys.stdout.buffer
+    with requests.Session() as s:
+        if args.output or not output.isatty():
+            if hasattr(s, "download"):
+                # Body is written by libcurl directly to the output
+                r = s.download(args.url, output, **kwargs)
+                if args.output:
+                    # Close the file
+                    r.close()
+                return
+
+            # Requests has no `Session.download`
+            with s.request(url=args.url, stream=True, **kwargs) as r:
+                f = open(output, "wb") if args.output else output
+                try:
+                    for chunk in r.iter_content(64 * 1024):
+                        f.write(chunk)
+                finally:
+                    if args.output:
+                        f.close()
+            return
+
+        r = s.request(url=args.url, **kwargs)
+
         content_type = r.headers.get("Content-Type", "application/octet-stream").lower()
         if (
             r.encoding
@@ -128,8 +146,6 @@ def main():
                 file=sys.stderr,
             )
             sys.exit(1)
-    else:
-        output.write(r.content)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# End-to-end benchmarks against a local HTTP server
+#
+# Each scenario is run in a separate process for each library, using the
+# `PYCURLREQUESTS_REQUESTS` switch to select Requests or PycURL-Requests.
+#
+# Usage:
+#   python tools/benchmark.py [--library pycurl_requests] [--output results.json]
+
+import argparse
+import concurrent.futures
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+LIBRARIES = ["pycurl_requests", "requests"]
+
+#: Size of bodies used for throughput scenarios
+LARGE_SIZE = 64 * 1024 * 1024
+
+#: Number of threads for the concurrency scenario
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16]
+
+
+class HTTPRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Mute HTTP logging
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/bytes":
+            n = int(dict(parse_qsl(url.query)).get("n", 0))
+            self.response(
+                self.server.payload[:n], content_type="application/octet-stream"
+            )
+        else:
+            self.response(b"Hello\nWorld\n")
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            self.send_error(411, "Length Required")
+            return
+
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+        self.response(b"OK\n")
+
+    def response(self, body, content_type="text/plain; charset=UTF-8"):
+        self.send_response(200, "OK")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(size: int) -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), HTTPRequestHandler)
+    httpd.daemon_threads = True
+    # Shared body for downloads (sliced without copying)
+    httpd.payload = memoryview(bytes(size))
+    httpd.base_url = "http://{}:{}".format(*httpd.server_address)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    return httpd
+
+
+# Scenarios (run in a worker process)
+
+
+def percentiles(samples) -> dict:
+    samples = sorted(samples)
+    return {
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p90_ms": samples[int(len(samples) * 0.9)] * 1000,
+        "p99_ms": samples[int(len(samples) * 0.99)] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def small_get_latency(requests, base_url, args) -> dict:
+    """Latency of small GETs using the module-level API (no connection reuse)."""
+    url = base_url + "/hello"
+    samples = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        requests.get(url).content
+        samples.append(time.perf_counter() - start)
+
+    return dict(percentiles(samples), iterations=len(samples))
+
+
+def session_throughput(requests, base_url, args) -> dict:
+    """Requests per second of small GETs on a reused Session."""
+    url = base_url + "/hello"
+    with requests.Session() as s:
+        # Establish connection
+        s.get(url).content
+
+        count = 0
+        samples = []
+        start = end = time.perf_counter()
+        while end - start < args.duration:
+            s.get(url).content
+            now = time.perf_counter()
+            samples.append(now - end)
+            end = now
+            count += 1
+
+    return dict(
+        percentiles(samples), requests=count, requests_per_second=count / (end - start)
+    )
+
+
+def download_throughput(requests, base_url, args) -> dict:
+    """Throughput of a large download."""
+    url = base_url + "/bytes?n={}".format(args.size)
+    with requests.Session() as s:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            size = len(s.get(url).content)
+            samples.append(time.perf_counter() - start)
+            assert size == args.size
+
+    best = min(samples)
+    return {
+        "bytes": args.size,
+        "seconds": best,
+        "mb_per_second": args.size / best / 1e6,
+    }
+
+
+def upload_throughput(requests, base_url, args) -> dict:
+    """Throughput of a large upload."""
+    url = base_url + "/upload"
+    body = bytes(args.size)
+    with requests.Session() as s:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            s.post(url, data=body).raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    best = min(samples)
+    return {
+        "bytes": args.size,
+        "seconds": best,
+        "mb_per_second": args.size / best / 1e6,
+    }
+
+
+def concurrency_scaling(requests, base_url, args) -> dict:
+    """Requests per second of small GETs from a number of threads sharing a Session."""
+    url = base_url + "/hello"
+
+    def worker(s, deadline):
+        count = 0
+        while time.perf_counter() < deadline:
+            s.get(url).content
+            count += 1
+
+        return count
+
+    results = {}
+    for threads in CONCURRENCY_LEVELS:
+        with requests.Session() as s:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                start = time.perf_counter()
+                deadline = start + args.duration
+                futures = [pool.submit(worker, s, deadline) for _ in range(threads)]
+                count = sum(f.result() for f in futures)
+                elapsed = time.perf_counter() - start
+
+        results[str(threads)] = {
+            "requests": count,
+            "requests_per_second": count / elapsed,
+        }
+
+    return {"threads": results}
+
+
+SCENARIOS = {
+    f.__name__: f
+    for f in (
+        small_get_latency,
+        session_throughput,
+        download_throughput,
+        upload_throughput,
+        concurrency_scaling,
+    )
+}
+
+
+def run_worker(args) -> None:
+    """Run a single scenario, writing the result as JSON to stdout."""
+    from pycurl_requests import requests
+
+    result = SCENARIOS[args.scenario](requests, args.url, args)
+    json.dump(result, sys.stdout)
+
+
+# Driver
+
+
+def get_metadata() -> dict:
+    import pycurl
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pycurl": pycurl.version,
+    }
+
+
+def run_scenario(library, scenario, base_url, args) -> dict:
+    env = dict(os.environ)
+    env.pop("PYCURLREQUESTS_REQUESTS", None)
+    if library == "requests":
+        env["PYCURLREQUESTS_REQUESTS"] = "1"
+
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--worker",
+        "--url={}".format(base_url),
+        "--scenario={}".format(scenario),
+        "--iterations={}".format(args.iterations),
+        "--duration={}".format(args.duration),
+        "--size={}".format(args.size),
+        "--repeat={}".format(args.repeat),
+    ]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+    result = {"library": library, "scenario": scenario}
+    p = subprocess.run(command, env=env, capture_output=True, text=True)
+    if p.returncode != 0:
+        result["error"] = p.stderr.strip().splitlines()[-1] if p.stderr else "failed"
+    else:
+        result["metrics"] = json.loads(p.stdout)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="End-to-end benchmarks against a local HTTP server"
+    )
+    parser.add_argument(
+        "--library",
+        action="append",
+        choices=LIBRARIES,
+        help="Library to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run (default: all)",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=500, help="Number of latency samples"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=3.0,
+        help="Seconds to run each throughput measurement for",
+    )
+    parser.add_argument(
+        "--size", type=int, default=LARGE_SIZE, help="Size of large bodies (bytes)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of large transfers (best is kept)"
+    )
+    parser.add_argument("-o", "--output", help="Write JSON results to file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        if isinstance(args.scenario, list):
+            args.scenario = args.scenario[0]
+        run_worker(args)
+        return
+
+    httpd = start_server(args.size)
+    results = []
+    try:
+        for scenario in args.scenario or list(SCENARIOS):
+            for library in args.library or LIBRARIES:
+                print("{}: {}...".format(scenario, library), file=sys.stderr)
+                results.append(run_scenario(library, scenario, httpd.base_url, args))
+    finally:
+        httpd.shutdown()
+
+    report = {"metadata": get_metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Measure the time taken to import a module (using `python -X importtime`)
+#
+# Usage:
+#   python tools/importtime.py [--runs 10] [--budget 100] [--json] [pycurl_requests]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+def measure(module):
+    """
+    Import `module` in a new interpreter.
+
+    Returns a dictionary of `name: (self_us, cumulative_us)` for each module imported.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the time taken to import a module"
+    )
+    parser.add_argument("module", nargs="?", default="pycurl_requests")
+    parser.add_argument("--runs", type=int, default=10, help="Number of imports")
+    parser.add_argument(
+        "--top", type=int, default=15, help="Number of slowest modules to show"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Exit with an error if the median import time exceeds this (ms)",
+    )
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = parser.parse_args()
+
+    # First import may include writing bytecode
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(args.runs)]
+
+    total_ms = statistics.median(r[args.module][1] for r in runs) / 1000
+    self_ms = {}
+    for name in runs[0]:
+        samples = [r[name][0] for r in runs if name in r]
+        self_ms[name] = statistics.median(samples) / 1000
+    slowest = sorted(self_ms.items(), key=lambda i: i[1], reverse=True)[: args.top]
+
+    if args.json:
+        result = {
+            "module": args.module,
+            "runs": args.runs,
+            "median_ms": total_ms,
+            "modules": len(runs[0]),
+            "slowest": dict(slowest),
+        }
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print(
+            "import {}: {:.1f} ms (median of {} runs, {} modules)".format(
+                args.module, total_ms, args.runs, len(runs[0])
+            )
+        )
+        for name, ms in slowest:
+            print("  {:8.2f} ms  {}".format(ms, name))
+
+    if args.budget is not None and total_ms > args.budget:
+        print(
+            "ERROR: import time {:.1f} ms exceeds budget of {:.1f} ms".format(
+                total_ms, args.budget
+            ),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()